@@ -3,36 +3,62 @@ Fix imports in restructured files
 """
 import os
 import re
+import mmap
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Mapping of old imports to new imports
+REPLACEMENTS = {
+    'from config import': 'from utils.config import',
+    'from data_handler import': 'from data.handler import',
+    'from indicators import': 'from data.indicators import',
+    'from fundamental_news import': 'from data.news import',
+    'from ml_engine import': 'from core.ml_engine import',
+    'from strategy import': 'from core.strategy import',
+    'from risk_manager import': 'from core.risk_manager import',
+    'from ai_predictor import': 'from ai.predictor import',
+    'from ai_models_config import': 'from ai.models_config import',
+    'from backtest import': 'from analysis.backtest import',
+    'from live_data_feed import': 'from analysis.live_feed import',
+    'import config': 'from utils import config',
+}
+
+# All old imports as one alternation, so each file is scanned once
+_PATTERN = re.compile('|'.join(re.escape(old) for old in REPLACEMENTS))
+# Same alternation over raw bytes, to probe files before decoding them
+_BYTES_PATTERN = re.compile(_PATTERN.pattern.encode('utf-8'))
+
+
+def _replace(match):
+    return REPLACEMENTS[match.group(0)]
+
+
+def _iter_py_files(directory):
+    """Recursively yield .py file paths using os.scandir"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_py_files(entry.path)
+            elif entry.name.endswith('.py'):
+                yield Path(entry.path)
+
+
 def fix_imports_in_file(filepath):
     """Fix import statements in a Python file"""
+    with open(filepath, 'rb') as f:
+        # Skip files with no old imports without decoding them (mmap can't map empty files)
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if _BYTES_PATTERN.search(mm) is None:
+                return False
+    
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Mapping of old imports to new imports
-    replacements = {
-        'from config import': 'from utils.config import',
-        'from data_handler import': 'from data.handler import',
-        'from indicators import': 'from data.indicators import',
-        'from fundamental_news import': 'from data.news import',
-        'from ml_engine import': 'from core.ml_engine import',
-        'from strategy import': 'from core.strategy import',
-        'from risk_manager import': 'from core.risk_manager import',
-        'from ai_predictor import': 'from ai.predictor import',
-        'from ai_models_config import': 'from ai.models_config import',
-        'from backtest import': 'from analysis.backtest import',
-        'from live_data_feed import': 'from analysis.live_feed import',
-        'import config': 'from utils import config',
-    }
-    
-    modified = False
-    for old, new in replacements.items():
-        if old in content:
-            content = content.replace(old, new)
-            modified = True
+    content, n = _PATTERN.subn(_replace, content)
     
-    if modified:
+    if n > 0:
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(content)
         return True
@@ -43,13 +69,21 @@ def main():
     scripts_dir = Path('scripts')
     tests_dir = Path('tests')
     
+    all_files = [
+        py_file
+        for directory in [src_dir, scripts_dir, tests_dir] if directory.exists()
+        for py_file in _iter_py_files(directory)
+    ]
+    
+    # Files are independent, so fix them in parallel worker processes
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(fix_imports_in_file, all_files, chunksize=16))
+    
     count = 0
-    for directory in [src_dir, scripts_dir, tests_dir]:
-        if directory.exists():
-            for py_file in directory.rglob('*.py'):
-                if fix_imports_in_file(py_file):
-                    print(f"✅ Fixed: {py_file}")
-                    count += 1
+    for py_file, fixed in zip(all_files, results):
+        if fixed:
+            print(f"✅ Fixed: {py_file}")
+            count += 1
     
     print(f"\n✅ Fixed {count} files")
 
@@ -218,7 +218,7 @@ class BiXTradeBOT:
         """Print position sizing information"""
         print("💼 Suggested Position:")
         print(f"  Direction:    {direction.upper()}")
-        print(f"  Size:         {position_info['size']} units")
+        print(f"  Size:         {position_info['size']:.6f} units")
         print(f"  Value:        ${position_info['value']:,.2f}")
         print(f"  Stop Loss:    ${position_info['stop_loss']:,.2f}")
         print(f"  Take Profit:  ${position_info['take_profit']:,.2f}")
@@ -97,8 +97,6 @@ def cmd_dashboard(args):
 
 def main():
     """Main entry point"""
-    print_banner()
-    
     parser = argparse.ArgumentParser(
         description='BRAINixIDEX Trading Bot - Advanced AI Trading System',
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -110,28 +108,34 @@ def main():
     analyze_parser = subparsers.add_parser('analyze', help='Run live market analysis')
     analyze_parser.add_argument('--symbol', default='BTCUSDT', help='Trading pair')
     analyze_parser.add_argument('--timeframe', default='1h', help='Timeframe')
+    analyze_parser.set_defaults(func=cmd_analyze)
     
     # Backtest command
     backtest_parser = subparsers.add_parser('backtest', help='Run strategy backtest')
     backtest_parser.add_argument('--symbol', default='BTCUSDT', help='Trading pair')
     backtest_parser.add_argument('--timeframe', default='1h', help='Timeframe')
+    backtest_parser.set_defaults(func=cmd_backtest)
     
     # Train command
     train_parser = subparsers.add_parser('train', help='Train ML models')
     train_parser.add_argument('--symbol', default='BTCUSDT', help='Trading pair')
     train_parser.add_argument('--timeframe', default='1h', help='Timeframe')
+    train_parser.set_defaults(func=cmd_train)
     
     # Price command
     price_parser = subparsers.add_parser('price', help='Show price information')
     price_parser.add_argument('--live', action='store_true', help='Live monitor mode')
+    price_parser.set_defaults(func=cmd_price)
     
     # Test command
     test_parser = subparsers.add_parser('test', help='Run tests')
     test_parser.add_argument('--ai-only', action='store_true', help='Test AI models only')
+    test_parser.set_defaults(func=cmd_test)
     
     # Dashboard command
     dashboard_parser = subparsers.add_parser('dashboard', help='Start web dashboard')
     dashboard_parser.add_argument('--port', type=int, default=5000, help='Port number')
+    dashboard_parser.set_defaults(func=cmd_dashboard)
     
     args = parser.parse_args()
     
@@ -139,18 +143,12 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    # Execute command
-    commands = {
-        'analyze': cmd_analyze,
-        'backtest': cmd_backtest,
-        'train': cmd_train,
-        'price': cmd_price,
-        'test': cmd_test,
-        'dashboard': cmd_dashboard
-    }
+    # Banner only for an interactive run of a valid command
+    if sys.stdout.isatty():
+        print_banner()
     
     try:
-        commands[args.command](args)
+        args.func(args)
     except KeyboardInterrupt:
         print(f"\n\n{Fore.YELLOW}⚠️  Interrupted by user{Style.RESET_ALL}")
     except Exception as e:
@@ -0,0 +1,42 @@
+"""
+Build Risk Kernels Ahead of Time
+================================
+Compile the risk manager's stop-loss / take-profit scan into a plain
+extension module (src/core/risk_kernels) so the first scan after start-up
+pays no JIT compile. Run once after installing the dependencies:
+
+    python scripts/build_risk_aot.py
+
+Requires numba and setuptools at build time only; RiskManager falls back to
+the JIT kernel when the module is missing.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from numba.pycc import CC
+
+from core.risk_manager import _scan_sltp
+
+# (current_price, stops, take_profits, directions) -> (indices, reasons)
+SCAN_SLTP_SIGNATURE = 'Tuple((i8[:], i1[:]))(f4, f4[:], f4[:], i1[:])'
+
+
+def main():
+    output_dir = Path(__file__).parent.parent / 'src' / 'core'
+
+    cc = CC('risk_kernels')
+    cc.output_dir = str(output_dir)
+    cc.verbose = False
+    cc.export('scan_sltp', SCAN_SLTP_SIGNATURE)(_scan_sltp.py_func)
+
+    print(f"🔨 Compiling risk kernels into {output_dir}...")
+    cc.compile()
+    print("✅ risk_kernels built")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 import pickle
+import joblib
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
@@ -24,14 +25,11 @@ class MLModelWrapper:
                  features_path='models/feature_columns.pkl'):
         """Load the improved model"""
         try:
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            
-            with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
-            
-            with open(features_path, 'rb') as f:
-                self.feature_columns = pickle.load(f)
+            # Memory-map the estimator's arrays (model files written by
+            # joblib.dump); plain pickles load as before
+            self.model = joblib.load(model_path, mmap_mode='r')
+            self.scaler = joblib.load(scaler_path)
+            self.feature_columns = joblib.load(features_path)
             
             print(f"✅ Model loaded: {len(self.feature_columns)} features")
             
@@ -54,11 +52,12 @@ class MLModelWrapper:
         if self.model is None:
             raise ValueError("Model not loaded")
         
-        # Get predictions
-        y_pred = self.model.predict(X_scaled)
-        y_proba = self.model.predict_proba(X_scaled)
+        # Tree models (LightGBM / RandomForest / GradientBoosting) work on
+        # float32, so a contiguous float32 input avoids an internal copy
+        X_scaled = np.ascontiguousarray(X_scaled, dtype=np.float32)
         
-        return y_proba
+        # Only the class probabilities are used
+        return self.model.predict_proba(X_scaled)
     
     def get_params(self, deep=True):
         """Compatibility method for sklearn"""
@@ -32,12 +32,19 @@ def get_live_price():
     print("📊 LIVE MARKET PRICES:")
     print("-" * 70)
     
+    try:
+        # One multi-symbol ticker request on the handler's (testnet-aware) client
+        prices = dh.fetch_latest_prices(symbols)
+        error = "not returned"
+    except Exception as e:
+        prices = {}
+        error = str(e)
+    
     for symbol in symbols:
-        try:
-            price = dh.fetch_latest_price(symbol)
-            print(f"  {symbol:12} → ${price:,.2f}")
-        except Exception as e:
-            print(f"  {symbol:12} → Error: {str(e)}")
+        if symbol in prices:
+            print(f"  {symbol:12} → ${prices[symbol]:,.2f}")
+        else:
+            print(f"  {symbol:12} → Error: {error}")
     
     print("=" * 70)
     print()
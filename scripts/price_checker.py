@@ -5,17 +5,26 @@ Compare prices from different sources to verify data accuracy.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from binance.client import Client
 from datetime import datetime
 from colorama import init, Fore, Style
 
 init(autoreset=True)
 
+# Pooled session shared by the price lookups (keep-alive, short retries)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2, pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.1)
+))
+
 def get_binance_price():
     """Get current price from Binance"""
     try:
         url = "https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT"
-        response = requests.get(url, timeout=5)
+        response = _SESSION.get(url, timeout=5)
         data = response.json()
         return float(data['price'])
     except Exception as e:
@@ -26,18 +35,39 @@ def get_coinmarketcap_price():
     try:
         # Using CoinGecko as alternative (free, no API key required)
         url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
-        response = requests.get(url, timeout=5)
+        response = _SESSION.get(url, timeout=5)
         data = response.json()
         return float(data['bitcoin']['usd'])
     except Exception as e:
         return f"Error: {e}"
 
+def read_last_csv_row(path, chunk_size=4096):
+    """
+    Read the header and last data row of a CSV without loading the file:
+    seek to the end and step back in chunks until a full line is in view.
+    
+    Returns:
+        dict: Column name -> string value of the last row
+    """
+    with open(path, 'rb') as f:
+        header = f.readline().decode().rstrip('\r\n').split(',')
+        
+        pos = f.seek(0, 2)
+        tail = b''
+        # Stop once a newline precedes the last (non-empty) line
+        while pos > 0 and tail.rstrip(b'\r\n').count(b'\n') < 1:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    
+    last_line = tail.rstrip(b'\r\n').rsplit(b'\n', 1)[-1].decode().rstrip('\r')
+    return dict(zip(header, last_line.split(',')))
+
 def get_cached_price():
     """Get last price from cache"""
     try:
-        import pandas as pd
-        df = pd.read_csv('data/cache/BTCUSDT_1h_2024-01-01_2025-10-20.csv')
-        last_row = df.iloc[-1]
+        last_row = read_last_csv_row('data/cache/BTCUSDT_1h_2024-01-01_2025-10-20.csv')
         timestamp = last_row['timestamp']
         price = float(last_row['close'])
         return price, timestamp
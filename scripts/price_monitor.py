@@ -1,10 +1,13 @@
 """
 Real-Time Live Price Monitor
 =============================
-Display current Bitcoin price with automatic refresh.
+Display current Bitcoin price, pushed by the Binance ticker stream.
 """
 
-import requests
+import asyncio
+import json
+import websockets
+from websockets.exceptions import ConnectionClosed
 import time
 from datetime import datetime
 from colorama import init, Fore, Style
@@ -12,28 +15,42 @@ import os
 
 init(autoreset=True)
 
+# 24h rolling ticker for BTC/USDT, pushed about once a second over one
+# persistent connection
+WS_URL = "wss://stream.binance.com:9443/ws/btcusdt@ticker"
+
 
 def clear_screen():
     """Clear terminal screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
-def get_live_price():
-    """Get current Bitcoin price from Binance"""
-    try:
-        url = "https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        
-        return {
-            'price': float(data['lastPrice']),
-            'high_24h': float(data['highPrice']),
-            'low_24h': float(data['lowPrice']),
-            'volume': float(data['volume']),
-            'price_change_pct': float(data['priceChangePercent'])
-        }
-    except Exception as e:
-        return None
+def parse_ticker(message):
+    """Map a ticker stream frame to the fields display_price shows"""
+    data = json.loads(message)
+    return {
+        'price': float(data['c']),
+        'high_24h': float(data['h']),
+        'low_24h': float(data['l']),
+        'volume': float(data['v']),
+        'price_change_pct': float(data['P'])
+    }
+
+
+async def stream_prices():
+    """Redraw on every ticker frame, reconnecting if the stream drops"""
+    async for ws in websockets.connect(WS_URL):
+        try:
+            async for message in ws:
+                # One bad frame shouldn't stop the monitor
+                try:
+                    data = parse_ticker(message)
+                except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
+                    print(f"{Fore.YELLOW}⚠️  Skipping malformed ticker frame: {e!r}{Style.RESET_ALL}")
+                    continue
+                display_price(data)
+        except ConnectionClosed:
+            display_price(None)
 
 
 def display_price(data):
@@ -81,11 +98,8 @@ def main():
     time.sleep(1)
     
     try:
-        while True:
-            data = get_live_price()
-            display_price(data)
-            time.sleep(5)  # Update every 5 seconds
-            
+        asyncio.run(stream_prices())
+        
     except KeyboardInterrupt:
         print(f"\n\n{Fore.YELLOW}📴 Stopped by user{Style.RESET_ALL}")
         print("=" * 70)
@@ -122,7 +122,7 @@ try:
     )
     
     print(f"✅ محاسبه position:")
-    print(f"   📊 حجم: {position['size']} واحد")
+    print(f"   📊 حجم: {position['size']:.6f} واحد")
     print(f"   💵 ارزش: ${position['value']:,.2f}")
     print(f"   🛑 حد ضرر: ${position['stop_loss']:,.2f}")
     print(f"   🎯 حد سود: ${position['take_profit']:,.2f}")
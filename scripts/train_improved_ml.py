@@ -18,6 +18,7 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
 import lightgbm as lgb
 import pickle
+import joblib
 from colorama import init, Fore, Style
 
 init(autoreset=True)
@@ -230,8 +231,8 @@ def main():
     print(f"\n{Fore.YELLOW}💾 Saving model and scaler...{Style.RESET_ALL}")
     Path('models').mkdir(exist_ok=True)
     
-    with open('models/trained_model.pkl', 'wb') as f:
-        pickle.dump(best_model, f)
+    # Uncompressed joblib file so loaders can memory-map the tree arrays
+    joblib.dump(best_model, 'models/trained_model.pkl', compress=0)
     
     with open('models/scaler.pkl', 'wb') as f:
         pickle.dump(scaler, f)
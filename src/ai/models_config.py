@@ -13,6 +13,7 @@ import os
 from enum import Enum
 from typing import Dict, Any, Optional
 import json
+from pathlib import Path
 
 
 class ModelType(Enum):
@@ -200,9 +201,13 @@ class AIModelsConfig:
     
     @classmethod
     def save_preference(cls, model_type: ModelType, filepath: str = "model_preference.json"):
-        """Save model preference to file"""
-        with open(filepath, 'w') as f:
-            json.dump({"selected_model": model_type.value}, f)
+        """Save model preference to file (skipped when unchanged)"""
+        content = json.dumps({"selected_model": model_type.value})
+        path = Path(filepath)
+        if path.exists() and path.read_text() == content:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
     
     @classmethod
     def load_preference(cls, filepath: str = "model_preference.json") -> ModelType:
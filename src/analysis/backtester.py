@@ -16,9 +16,91 @@ from plotly.subplots import make_subplots
 from typing import Dict, List, Tuple
 import logging
 
+from utils.downsample import lttb
+from utils._njit import njit
+
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _backtest_kernel(close, signals, capital, commission):
+    """
+    Bar-by-bar position loop on plain arrays (compiled when numba is installed)
+    
+    Args:
+        close: Close prices
+        signals: Position signal per bar (-1, 0, 1)
+        capital: Starting capital
+        commission: Commission per side
+        
+    Returns:
+        Tuple of (equity, entry_idx, exit_idx, side, profit, profit_usd, final_capital)
+    """
+    n = len(close)
+    equity = np.empty(n + 1)
+    equity[0] = capital
+    
+    entry_idx = np.empty(n + 1, dtype=np.int64)
+    exit_idx = np.empty(n + 1, dtype=np.int64)
+    side = np.empty(n + 1)
+    profit = np.empty(n + 1)
+    profit_usd = np.empty(n + 1)
+    n_trades = 0
+    
+    position = 0.0  # 0 = no position, 1 = long, -1 = short
+    entry_price = 0.0
+    entry_i = 0
+    
+    for i in range(n):
+        current_price = close[i]
+        signal = signals[i]
+        
+        # Close existing position if signal changes
+        if position != 0 and signal != position:
+            if position == 1:  # Close long
+                p = (current_price - entry_price) / entry_price
+            else:  # Close short
+                p = (entry_price - current_price) / entry_price
+            p -= commission * 2  # Entry + exit
+            capital *= (1 + p)
+            
+            entry_idx[n_trades] = entry_i
+            exit_idx[n_trades] = i
+            side[n_trades] = position
+            profit[n_trades] = p
+            profit_usd[n_trades] = capital - equity[i]
+            n_trades += 1
+            position = 0.0
+        
+        # Open new position
+        if position == 0 and signal != 0:
+            position = signal
+            entry_price = current_price
+            entry_i = i
+        
+        equity[i + 1] = capital
+    
+    # Close final position if open
+    if position != 0:
+        current_price = close[n - 1]
+        if position == 1:
+            p = (current_price - entry_price) / entry_price
+        else:
+            p = (entry_price - current_price) / entry_price
+        p -= commission * 2
+        capital *= (1 + p)
+        
+        entry_idx[n_trades] = entry_i
+        exit_idx[n_trades] = n - 1
+        side[n_trades] = position
+        profit[n_trades] = p
+        profit_usd[n_trades] = capital - equity[n]
+        n_trades += 1
+    
+    return (equity, entry_idx[:n_trades], exit_idx[:n_trades], side[:n_trades],
+            profit[:n_trades], profit_usd[:n_trades], capital)
+
+
 class StrategyBacktester:
     """Backtest trading strategy and visualize results"""
     
@@ -50,87 +132,39 @@ class StrategyBacktester:
         Returns:
             Dictionary with backtest results
         """
-        # Align predictions with dataframe
-        # Predictions might be shorter due to indicator calculation
-        df = df.copy()
+        close = df['close'].to_numpy(dtype=np.float64)
+        timestamps = df['timestamp'] if 'timestamp' in df.columns else df.index.to_series()
         
-        # Reset index to get timestamp as column
-        if 'timestamp' not in df.columns:
-            df = df.reset_index()
-        
-        # Pad predictions with 0 (HOLD) at the beginning
-        if len(predictions) < len(df):
-            padding = np.zeros(len(df) - len(predictions))
-            predictions = np.concatenate([padding, predictions])
-        
-        df['prediction'] = predictions[:len(df)]
+        # Align predictions with dataframe
+        # Predictions might be shorter due to indicator calculation:
+        # pad with 0 (HOLD) at the beginning
+        signals = np.asarray(predictions, dtype=np.float64)
+        if len(signals) < len(close):
+            padding = np.zeros(len(close) - len(signals))
+            signals = np.concatenate([padding, signals])
+        signals = signals[:len(close)]
         
-        capital = self.initial_capital
-        position = 0  # 0 = no position, 1 = long, -1 = short
-        entry_price = 0
-        entry_time = None
-        trades = []
-        equity = [capital]
+        (equity_array, entry_idx, exit_idx, sides,
+         profits, profits_usd, capital) = _backtest_kernel(
+            close, signals, float(self.initial_capital), commission
+        )
         
-        for i in range(len(df)):
-            current_price = df.iloc[i]['close']
-            signal = df.iloc[i]['prediction']
-            
-            # Close existing position if signal changes
-            if position != 0 and signal != position:
-                # Calculate profit/loss
-                if position == 1:  # Close long
-                    profit = (current_price - entry_price) / entry_price
-                else:  # Close short
-                    profit = (entry_price - current_price) / entry_price
-                
-                # Apply commission
-                profit -= commission * 2  # Entry + exit
-                
-                capital *= (1 + profit)
-                
-                trades.append({
-                    'entry_time': entry_time,
-                    'exit_time': df.iloc[i]['timestamp'],
-                    'entry_price': entry_price,
-                    'exit_price': current_price,
-                    'position': 'LONG' if position == 1 else 'SHORT',
-                    'profit_pct': profit * 100,
-                    'profit_usd': capital - equity[-1],
-                    'result': 'WIN' if profit > 0 else 'LOSS'
-                })
-                
-                position = 0
-            
-            # Open new position
-            if position == 0 and signal != 0:
-                position = signal
-                entry_price = current_price
-                entry_time = df.iloc[i]['timestamp']
-            
-            equity.append(capital)
-        
-        # Close final position if open
-        if position != 0:
-            current_price = df.iloc[-1]['close']
-            if position == 1:
-                profit = (current_price - entry_price) / entry_price
-            else:
-                profit = (entry_price - current_price) / entry_price
-            
-            profit -= commission * 2
-            capital *= (1 + profit)
-            
-            trades.append({
-                'entry_time': entry_time,
-                'exit_time': df.iloc[-1]['timestamp'],
-                'entry_price': entry_price,
-                'exit_price': current_price,
-                'position': 'LONG' if position == 1 else 'SHORT',
-                'profit_pct': profit * 100,
-                'profit_usd': capital - equity[-1],
-                'result': 'WIN' if profit > 0 else 'LOSS'
-            })
+        entry_times = timestamps.iloc[entry_idx].tolist()
+        exit_times = timestamps.iloc[exit_idx].tolist()
+        trades = [
+            {
+                'entry_time': entry_times[k],
+                'exit_time': exit_times[k],
+                'entry_price': close[entry_idx[k]],
+                'exit_price': close[exit_idx[k]],
+                'position': 'LONG' if sides[k] == 1 else 'SHORT',
+                'profit_pct': profits[k] * 100,
+                'profit_usd': profits_usd[k],
+                'result': 'WIN' if profits[k] > 0 else 'LOSS'
+            }
+            for k in range(len(profits))
+        ]
+        equity = equity_array.tolist()
         
         self.trades = trades
         self.equity_curve = equity
@@ -151,7 +185,6 @@ class StrategyBacktester:
             sharpe = np.mean(returns) / np.std(returns) if np.std(returns) > 0 else 0
             
             # Max drawdown
-            equity_array = np.array(equity)
             running_max = np.maximum.accumulate(equity_array)
             drawdown = (equity_array - running_max) / running_max * 100
             max_drawdown = np.min(drawdown)
@@ -301,11 +334,11 @@ class StrategyBacktester:
                 row=2, col=1
             )
         
-        # 3. Equity curve
-        equity = backtest_results['equity_curve']
+        # 3. Equity curve (LTTB keeps its shape with far fewer points)
+        equity = lttb(pd.Series(backtest_results['equity_curve'], dtype=float))
         fig.add_trace(
             go.Scatter(
-                x=list(range(len(equity))),
+                x=equity.index,
                 y=equity,
                 name='Equity',
                 line=dict(color='blue', width=2),
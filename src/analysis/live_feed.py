@@ -30,6 +30,7 @@ import pandas as pd
 import numpy as np
 from collections import deque
 import json
+import threading
 import time
 
 # Configure logging
@@ -57,6 +58,10 @@ class DataIntegrator:
         self.cache_ttl = 60  # Cache time-to-live in seconds
         self.last_update = None
         
+        # HTTP session reused across fetches (DNS/TLS handshakes amortized)
+        self._session = None
+        self._session_loop = None
+        
         # API configurations
         self.apis = {
             'coingecko': {
@@ -86,6 +91,9 @@ class DataIntegrator:
             'exponential_base': 2
         }
         
+        # Seconds CoinGecko gets to answer before Binance is also requested
+        self.failover_delay = 1.5
+        
         logger.info(f"🚀 DataIntegrator initialized: Tracking top {top_n_coins} coins")
     
     async def fetch_coingecko_data(self, session: aiohttp.ClientSession) -> Optional[List[Dict]]:
@@ -143,28 +151,67 @@ class DataIntegrator:
             logger.error(f"❌ Binance error: {str(e)}")
             return None
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it for the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Session from an earlier event loop: release its connections
+                try:
+                    await self._session.close()
+                except RuntimeError:
+                    pass  # its loop is already closed, nothing left to release
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     async def fetch_with_failover(self) -> Optional[List[Dict]]:
         """
         Fetch data with automatic failover between APIs.
         
+        CoinGecko is asked first; Binance is only requested if CoinGecko
+        fails or hasn't answered within ``failover_delay``, so a slow
+        CoinGecko costs about the delay plus one Binance RTT while a healthy
+        one adds no Binance traffic.
+        
         Returns:
             Raw data from successful API or None if all fail
         """
-        async with aiohttp.ClientSession() as session:
-            # Try CoinGecko first (priority 1)
-            coingecko_data = await self.fetch_coingecko_data(session)
-            if coingecko_data:
-                return ('coingecko', coingecko_data)
-            
-            logger.warning("⚠️ CoinGecko failed, switching to Binance...")
-            
-            # Fallback to Binance
-            binance_data = await self.fetch_binance_data(session)
-            if binance_data:
-                return ('binance', binance_data)
-            
-            logger.error("❌ All APIs failed!")
-            return None
+        session = await self._get_session()
+        coingecko_task = asyncio.ensure_future(self.fetch_coingecko_data(session))
+        binance_task = None
+        
+        # Prefer CoinGecko (priority 1)
+        done, _ = await asyncio.wait({coingecko_task}, timeout=self.failover_delay)
+        if not done:
+            # Slow answer: hedge with Binance while CoinGecko keeps going
+            binance_task = asyncio.ensure_future(self.fetch_binance_data(session))
+        
+        coingecko_data = await coingecko_task
+        if coingecko_data:
+            if binance_task is not None:
+                binance_task.cancel()
+            return ('coingecko', coingecko_data)
+        
+        logger.warning("⚠️ CoinGecko failed, switching to Binance...")
+        
+        # Fallback to Binance (possibly already in flight)
+        if binance_task is None:
+            binance_task = asyncio.ensure_future(self.fetch_binance_data(session))
+        binance_data = await binance_task
+        if binance_data:
+            return ('binance', binance_data)
+        
+        logger.error("❌ All APIs failed!")
+        return None
     
     async def fetch_live_data(self) -> Optional[Tuple[str, List[Dict]]]:
         """
@@ -518,6 +565,11 @@ class LiveDataFeed:
         self.latest_data = None
         self.data_history = deque(maxlen=500)  # Store 500 recent samples per coin
         
+        # Background worker (one event loop reused for every fetch)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._feed_future = None
+        
         logger.info(f"🎯 LiveDataFeed initialized: Top {top_n_coins} coins, {update_interval}s updates")
     
     async def fetch_and_process(self) -> Optional[List[Dict]]:
@@ -589,7 +641,8 @@ class LiveDataFeed:
                 data = await self.fetch_and_process()
                 
                 if data:
-                    self.latest_data = data
+                    with self._lock:
+                        self.latest_data = data
                     
                     # Call callback if provided
                     if callback:
@@ -607,9 +660,60 @@ class LiveDataFeed:
         self.is_running = False
         logger.info("🛑 Stopping live data feed...")
     
+    def _ensure_loop(self):
+        """Start the worker thread owning this feed's event loop (once)."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="LiveDataFeedLoop",
+                    daemon=True
+                ).start()
+        return self._loop
+    
+    def start_background(self):
+        """
+        Run the continuous feed on the background event loop.
+        
+        Returns immediately; call get_latest_data() to read the newest sample.
+        Does nothing if the feed loop is already running.
+        """
+        loop = self._ensure_loop()
+        with self._lock:
+            self.is_running = True
+            if self._feed_future is not None and not self._feed_future.done():
+                return
+            self._feed_future = asyncio.run_coroutine_threadsafe(
+                self.start_continuous_feed(), loop
+            )
+    
+    def fetch_once(self, timeout: float = 60) -> Optional[List[Dict]]:
+        """
+        Fetch and process one sample on the background event loop.
+        
+        Blocking counterpart of fetch_and_process() for synchronous callers
+        (e.g. Streamlit), without creating a new event loop per call.
+        
+        Args:
+            timeout: Seconds to wait for the result
+            
+        Returns:
+            Processed and validated data
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_and_process(), self._ensure_loop()
+        )
+        data = future.result(timeout)
+        if data:
+            with self._lock:
+                self.latest_data = data
+        return data
+    
     def get_latest_data(self) -> Optional[List[Dict]]:
         """Get the most recent data."""
-        return self.latest_data
+        with self._lock:
+            return self.latest_data
     
     def get_historical_data(self, symbol: str, limit: int = 100) -> pd.DataFrame:
         """
@@ -669,6 +773,8 @@ async def example_usage():
     # Get system status
     status = feed.get_system_status()
     print(f"\n📈 System Status: {json.dumps(status, indent=2)}")
+    
+    await feed.integrator.close()
 
 
 if __name__ == '__main__':
@@ -66,8 +66,19 @@ class BiXTradeBOT:
         self.strategy = SimpleHybridStrategy(use_ml=Config.ML_ENABLED)
         self.risk_manager = RiskManager()
 
+        self._warm_up()
+
         logger.info("✅ All modules initialized")
 
+    def _warm_up(self):
+        """
+        Move JIT compilation and LightGBM thread-pool start-up to launch
+        instead of the first analysed tick
+        """
+        TechnicalIndicators.warm_up_kernels()
+        if self.ml_engine and self.ml_engine.load_model():
+            self.ml_engine.warm_up()
+
     def run_backtest(self, plot_results=True):
         """
         Run backtesting mode.
@@ -215,7 +226,7 @@ class BiXTradeBOT:
         """Print position sizing information"""
         print("💼 Suggested Position:")
         print(f"  Direction:    {direction.upper()}")
-        print(f"  Size:         {position_info['size']} units")
+        print(f"  Size:         {position_info['size']:.6f} units")
         print(f"  Value:        ${position_info['value']:,.2f}")
         print(f"  Stop Loss:    ${position_info['stop_loss']:,.2f}")
         print(f"  Take Profit:  ${position_info['take_profit']:,.2f}")
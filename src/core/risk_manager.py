@@ -7,12 +7,86 @@ Author: SALMAN ThinkTank AI Core
 Version: 1.0.0
 """
 
+import time
 import pandas as pd
+import numpy as np
 import logging
 from utils.config import Config
+from utils._njit import njit, NUMBA_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# Closed-trade record: fixed-width fields, times as UTC datetime64, direction
+# as +1 long / -1 short and exit reason as an index into
+# RiskManager._exit_reasons
+TRADE_DTYPE = np.dtype([
+    ('symbol', 'U32'),
+    ('entry_price', 'f8'),
+    ('size', 'f8'),
+    ('direction', 'i1'),
+    ('stop_loss', 'f8'),
+    ('take_profit', 'f8'),
+    ('entry_time', 'M8[ns]'),
+    ('exit_price', 'f8'),
+    ('exit_time', 'M8[ns]'),
+    ('pnl', 'f8'),
+    ('pnl_percent', 'f8'),
+    ('exit_reason', 'u2'),
+    ('equity_after', 'f8')
+])
+
+# Close-log marker indexed by pnl > 0
+_PNL_EMOJI = ("❤️", "💚")
+
+# From this many open positions the SL/TP check runs on the arrays (numba
+# scan, else NumPy); below it the per-position loop is cheaper than the
+# call overhead
+VECTOR_SCAN_MIN_POSITIONS = 32
+
+
+@njit(cache=True)
+def _scan_sltp(current_price, stops, tps, dirs):
+    """
+    One pass over the open positions' levels (compiled when numba is
+    installed); stop loss wins when both levels are hit.
+
+    Returns:
+        tuple: (indices, reasons) arrays of the hit positions, reason
+        0 = stop loss, 1 = take profit
+    """
+    n = stops.shape[0]
+    out_idx = np.empty(n, dtype=np.int64)
+    out_reason = np.empty(n, dtype=np.int8)
+    count = 0
+    for i in range(n):
+        d = dirs[i]
+        if d * (current_price - stops[i]) <= 0:
+            out_idx[count] = i
+            out_reason[count] = 0
+            count += 1
+        elif d * (tps[i] - current_price) <= 0:
+            out_idx[count] = i
+            out_reason[count] = 1
+            count += 1
+    return out_idx[:count], out_reason[:count]
+
+
+# Prefer the ahead-of-time build from scripts/build_risk_aot.py: a plain
+# extension module, so the first scan pays no JIT compile
+try:
+    from core.risk_kernels import scan_sltp as _scan_sltp_kernel
+    SCAN_KERNEL_AVAILABLE = True
+except ImportError:
+    _scan_sltp_kernel = _scan_sltp
+    SCAN_KERNEL_AVAILABLE = NUMBA_AVAILABLE
+
+
+def _grown(arr):
+    """Copy of ``arr`` with doubled capacity (extra slots uninitialised)"""
+    out = np.empty(2 * len(arr), dtype=arr.dtype)
+    out[:len(arr)] = arr
+    return out
+
 
 class RiskManager:
     """
@@ -20,6 +94,15 @@ class RiskManager:
     and dynamic stop loss.
     """
 
+    # Fixed attribute layout: no per-instance __dict__ on the hot paths
+    __slots__ = (
+        'initial_capital', 'current_equity',
+        '_stop_mul', '_max_pct', '_rr',
+        'positions', '_stops', '_tps', '_dirs', '_n_open',
+        '_trades', '_n_trades', '_exit_reasons', '_exit_reason_codes',
+        '_n_wins', '_n_losses', '_gross_profit', '_gross_loss', '_sum_pnl'
+    )
+
     def __init__(self, initial_capital=None):
         """
         Initialize risk manager.
@@ -29,8 +112,39 @@ class RiskManager:
         """
         self.initial_capital = initial_capital or Config.INITIAL_CAPITAL
         self.current_equity = self.initial_capital
+
+        # Sizing constants never change at runtime, so bind them once.
+        # RISK_PER_TRADE stays a live Config read: the dashboard edits it on
+        # a RiskManager kept in its session state
+        self._stop_mul = Config.ATR_STOP_MULTIPLIER
+        self._max_pct = Config.MAX_POSITION_SIZE
+        self._rr = Config.RISK_REWARD_RATIO
+
         self.positions = []
-        self.trade_history = []
+
+        # Stops, targets and directions (+1 long / -1 short) of the open
+        # positions as parallel arrays, in self.positions order; only the
+        # first self._n_open slots are live. Levels are float32 to halve the
+        # bytes the scan moves; the scan's hits are re-checked against the
+        # float64 levels in self.positions
+        self._stops = np.empty(8, dtype=np.float32)
+        self._tps = np.empty(8, dtype=np.float32)
+        self._dirs = np.empty(8, dtype=np.int8)
+        self._n_open = 0
+
+        # Closed trades, oldest first; only the first self._n_trades rows
+        # are filled
+        self._trades = np.empty(64, dtype=TRADE_DTYPE)
+        self._n_trades = 0
+        self._exit_reasons = []
+        self._exit_reason_codes = {}
+
+        # Running P&L totals so the stats don't rescan the trade array
+        self._n_wins = 0
+        self._n_losses = 0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
+        self._sum_pnl = 0.0
 
         logger.info(
             f"💼 Risk Manager initialized with "
@@ -57,57 +171,90 @@ class RiskManager:
                 'take_profit': take profit price
             }
         """
+        equity = self.current_equity
+        max_position_pct = self._max_pct
+
         # Risk amount in USD
-        risk_amount = self.current_equity * Config.RISK_PER_TRADE
+        risk_amount = equity * Config.RISK_PER_TRADE
 
         # Stop loss distance
-        stop_distance = atr * Config.ATR_STOP_MULTIPLIER
+        stop_distance = atr * self._stop_mul
 
-        # Position size calculation
-        position_size = risk_amount / stop_distance
-
-        # Position value
+        # Position size: risk-based, capped at the max position value
+        risk_size = risk_amount / stop_distance
+        max_size = equity * max_position_pct / entry_price
+        position_size = min(risk_size, max_size)
         position_value = position_size * entry_price
 
-        # Apply max position size constraint
-        max_position_value = self.current_equity * Config.MAX_POSITION_SIZE
-        if position_value > max_position_value:
-            position_value = max_position_value
-            position_size = position_value / entry_price
+        if risk_size > max_size and logger.isEnabledFor(logging.WARNING):
             logger.warning(
                 f"⚠️  Position size capped at "
-                f"{Config.MAX_POSITION_SIZE*100}% of equity"
+                f"{max_position_pct*100}% of equity"
             )
 
         # Calculate stop loss and take profit
+        target_distance = stop_distance * self._rr
         if direction == 'long':
             stop_loss = entry_price - stop_distance
-            take_profit = entry_price + (
-                stop_distance * Config.RISK_REWARD_RATIO
-            )
+            take_profit = entry_price + target_distance
         else:  # short
             stop_loss = entry_price + stop_distance
-            take_profit = entry_price - (
-                stop_distance * Config.RISK_REWARD_RATIO
-            )
+            take_profit = entry_price - target_distance
 
         result = {
-            'size': round(position_size, 6),
-            'value': round(position_value, 2),
-            'stop_loss': round(stop_loss, 2),
-            'take_profit': round(take_profit, 2),
-            'risk_amount': round(risk_amount, 2)
+            'size': position_size,
+            'value': position_value,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'risk_amount': risk_amount
         }
 
-        logger.debug(
-            f"📊 Position: {result['size']} units "
-            f"(${result['value']:,.2f}) | "
-            f"SL: ${result['stop_loss']:,.2f} | "
-            f"TP: ${result['take_profit']:,.2f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"📊 Position: {result['size']:.6f} units "
+                f"(${result['value']:,.2f}) | "
+                f"SL: ${result['stop_loss']:,.2f} | "
+                f"TP: ${result['take_profit']:,.2f}"
+            )
 
         return result
 
+    def calculate_position_size_batch(self, entry_prices, atrs, directions):
+        """
+        Vectorized calculate_position_size for many signals at once, all
+        sized against the current equity.
+
+        Args:
+            entry_prices (array-like): Entry prices
+            atrs (array-like): ATR at each entry
+            directions (array-like): 'long' or 'short' per entry
+
+        Returns:
+            dict: Same keys as calculate_position_size, each an array
+        """
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        atrs = np.asarray(atrs, dtype=np.float64)
+        sign = np.where(np.asarray(directions) == 'long', 1.0, -1.0)
+
+        equity = self.current_equity
+        risk_amount = equity * Config.RISK_PER_TRADE
+        stop_distance = atrs * self._stop_mul
+
+        position_size = np.minimum(
+            risk_amount / stop_distance,
+            equity * self._max_pct / entry_prices
+        )
+        stop_loss = entry_prices - sign * stop_distance
+        take_profit = entry_prices + sign * stop_distance * self._rr
+
+        return {
+            'size': position_size,
+            'value': position_size * entry_prices,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'risk_amount': np.full(len(entry_prices), risk_amount)
+        }
+
     def open_position(self, symbol, entry_price, size, direction,
                       stop_loss, take_profit):
         """
@@ -131,15 +278,27 @@ class RiskManager:
             'direction': direction,
             'stop_loss': stop_loss,
             'take_profit': take_profit,
-            'entry_time': pd.Timestamp.now(),
+            # UTC; datetime64 from the ns clock is far cheaper than a Timestamp
+            'entry_time': np.datetime64(time.time_ns(), 'ns'),
             'status': 'open'
         }
 
         self.positions.append(position)
-        logger.info(
-            f"🟢 Opened {direction.upper()} position: "
-            f"{size} {symbol} @ ${entry_price:,.2f}"
-        )
+
+        n = self._n_open
+        if n == len(self._stops):
+            self._stops = _grown(self._stops)
+            self._tps = _grown(self._tps)
+            self._dirs = _grown(self._dirs)
+        self._stops[n] = stop_loss
+        self._tps[n] = take_profit
+        self._dirs[n] = 1 if direction == 'long' else -1
+        self._n_open = n + 1
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"🟢 Opened {direction.upper()} position: "
+                f"{size} {symbol} @ ${entry_price:,.2f}"
+            )
 
         return position
 
@@ -158,14 +317,17 @@ class RiskManager:
         if position_index >= len(self.positions):
             logger.error(f"❌ Invalid position index: {position_index}")
             return None
+        if position_index < 0:
+            position_index += len(self.positions)
 
         position = self.positions[position_index]
 
-        # Calculate P&L
-        if position['direction'] == 'long':
-            pnl = (exit_price - position['entry_price']) * position['size']
-        else:  # short
-            pnl = (position['entry_price'] - exit_price) * position['size']
+        # Calculate P&L; the percentage is the price move, so it needs no
+        # size or entry value
+        entry_price = position['entry_price']
+        sign = 1.0 if position['direction'] == 'long' else -1.0
+        pnl = (exit_price - entry_price) * position['size'] * sign
+        pnl_percent = (exit_price / entry_price - 1.0) * (100.0 * sign)
 
         # Update equity
         self.current_equity += pnl
@@ -174,27 +336,93 @@ class RiskManager:
         trade = {
             **position,
             'exit_price': exit_price,
-            'exit_time': pd.Timestamp.now(),
-            'pnl': round(pnl, 2),
-            'pnl_percent': round(
-                (pnl / (position['entry_price'] * position['size'])) * 100,
-                2
-            ),
+            'exit_time': np.datetime64(time.time_ns(), 'ns'),
+            'pnl': pnl,
+            'pnl_percent': pnl_percent,
             'exit_reason': exit_reason,
-            'equity_after': round(self.current_equity, 2)
+            'equity_after': self.current_equity
         }
 
-        self.trade_history.append(trade)
+        self._record_trade(trade)
+
+        # Later positions keep their order and shift down one slot, in the
+        # list and in the parallel arrays
         self.positions.pop(position_index)
+        n = self._n_open - 1
+        for arr in (self._stops, self._tps, self._dirs):
+            arr[position_index:n] = arr[position_index + 1:n + 1]
+        self._n_open = n
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"{_PNL_EMOJI[int(pnl > 0)]} Closed {position['direction'].upper()} position: "
+                f"P&L ${pnl:,.2f} ({trade['pnl_percent']:.2f}%) | "
+                f"Equity: ${self.current_equity:,.2f}"
+            )
 
-        pnl_emoji = "💚" if pnl > 0 else "❤️"
-        logger.info(
-            f"{pnl_emoji} Closed {position['direction'].upper()} position: "
-            f"P&L ${pnl:,.2f} ({trade['pnl_percent']}%) | "
-            f"Equity: ${self.current_equity:,.2f}"
+        return trade
+
+    def _record_trade(self, trade):
+        """Append a closed trade to the trade array"""
+        reason_code = self._exit_reason_codes.get(trade['exit_reason'])
+        if reason_code is None:
+            reason_code = len(self._exit_reasons)
+            self._exit_reasons.append(trade['exit_reason'])
+            self._exit_reason_codes[trade['exit_reason']] = reason_code
+
+        if self._n_trades == len(self._trades):
+            self._trades = _grown(self._trades)
+        self._trades[self._n_trades] = (
+            trade['symbol'],
+            trade['entry_price'],
+            trade['size'],
+            1 if trade['direction'] == 'long' else -1,
+            trade['stop_loss'],
+            trade['take_profit'],
+            trade['entry_time'],
+            trade['exit_price'],
+            trade['exit_time'],
+            trade['pnl'],
+            trade['pnl_percent'],
+            reason_code,
+            trade['equity_after']
         )
+        self._n_trades += 1
+
+        pnl = trade['pnl']
+        self._sum_pnl += pnl
+        if pnl > 0:
+            self._n_wins += 1
+            self._gross_profit += pnl
+        elif pnl < 0:
+            self._n_losses += 1
+            self._gross_loss -= pnl
+
+    @property
+    def n_trades(self):
+        """Number of closed trades"""
+        return self._n_trades
+
+    def trades_frame(self):
+        """Closed trades as a new DataFrame, columns as in close_position's dict"""
+        trades = self._trades[:self._n_trades]
+        df = pd.DataFrame(trades)
+        df['direction'] = np.where(trades['direction'] > 0, 'long', 'short')
+        df['exit_reason'] = np.array(
+            self._exit_reasons, dtype=object
+        )[trades['exit_reason']]
+        df.insert(df.columns.get_loc('entry_time') + 1, 'status', 'open')
+        return df
+
+    @property
+    def trade_history(self):
+        """
+        Closed trades as a read-only tuple of dicts, oldest first.
 
-        return trade
+        Built from the trade array on every access; use n_trades for a count
+        and trades_frame() for a DataFrame.
+        """
+        return tuple(self.trades_frame().to_dict('records'))
 
     def check_stop_loss_take_profit(self, current_price):
         """
@@ -204,11 +432,47 @@ class RiskManager:
             current_price (float): Current market price
 
         Returns:
-            list: Positions to close
+            list: (index, reason) of positions to close, by ascending index
+        """
+        n = self._n_open
+        if n < VECTOR_SCAN_MIN_POSITIONS:
+            return self._scan_positions(current_price)
+
+        # Candidate scan at the levels' float32 precision
+        price = np.float32(current_price)
+
+        if SCAN_KERNEL_AVAILABLE:
+            idx, _ = _scan_sltp_kernel(
+                price,
+                self._stops[:n], self._tps[:n], self._dirs[:n]
+            )
+        else:
+            dirs = self._dirs[:n]
+
+            # Signed distances: <= 0 once price is through the level
+            hit_sl = dirs * (price - self._stops[:n]) <= 0
+            hit_tp = dirs * (self._tps[:n] - price) <= 0
+            idx = np.flatnonzero(hit_sl | hit_tp)
+
+        # Rounding is monotonic, so the float32 hits include every real hit
+        # plus near misses within one float32 step; settle the candidates at
+        # full precision so the answer doesn't depend on the book size
+        return self._scan_positions(current_price, idx.tolist())
+
+    def _scan_positions(self, current_price, indices=None):
         """
+        Per-position SL/TP check against the float64 levels, cheaper than
+        NumPy for a few positions; only ``indices`` are checked if given
+        """
+        positions = self.positions
+        if indices is None:
+            candidates = enumerate(positions)
+        else:
+            candidates = ((i, positions[i]) for i in indices)
+
         to_close = []
 
-        for i, position in enumerate(self.positions):
+        for i, position in candidates:
             if position['direction'] == 'long':
                 if current_price <= position['stop_loss']:
                     to_close.append((i, 'stop_loss'))
@@ -229,7 +493,7 @@ class RiskManager:
         Returns:
             dict: Performance metrics
         """
-        if not self.trade_history:
+        if self._n_trades == 0:
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -239,19 +503,15 @@ class RiskManager:
                 'equity_return': 0
             }
 
-        df = pd.DataFrame(self.trade_history)
-
-        winning_trades = df[df['pnl'] > 0]
-        losing_trades = df[df['pnl'] < 0]
-
-        total_wins = len(winning_trades)
-        total_losses = len(losing_trades)
-        total_trades = len(df)
+        # Derived from the running totals kept by _record_trade
+        total_wins = self._n_wins
+        total_losses = self._n_losses
+        total_trades = self._n_trades
 
-        win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
+        win_rate = total_wins / total_trades * 100
 
-        gross_profit = winning_trades['pnl'].sum() if total_wins > 0 else 0
-        gross_loss = abs(losing_trades['pnl'].sum()) if total_losses > 0 else 1
+        gross_profit = self._gross_profit
+        gross_loss = self._gross_loss if total_losses > 0 else 1
 
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
 
@@ -260,13 +520,14 @@ class RiskManager:
             'winning_trades': total_wins,
             'losing_trades': total_losses,
             'win_rate': round(win_rate, 2),
-            'total_pnl': round(df['pnl'].sum(), 2),
-            'avg_win': round(
-                winning_trades['pnl'].mean(), 2
-            ) if total_wins > 0 else 0,
-            'avg_loss': round(
-                losing_trades['pnl'].mean(), 2
-            ) if total_losses > 0 else 0,
+            'total_pnl': round(self._sum_pnl, 2),
+            'avg_win': (
+                round(gross_profit / total_wins, 2) if total_wins > 0 else 0
+            ),
+            'avg_loss': (
+                round(-self._gross_loss / total_losses, 2)
+                if total_losses > 0 else 0
+            ),
             'profit_factor': round(profit_factor, 2),
             'current_equity': round(self.current_equity, 2),
             'equity_return': round(
@@ -280,11 +541,14 @@ class RiskManager:
 
     def export_trade_log(self, filename='trade_log.csv'):
         """Export trade history to CSV"""
-        if not self.trade_history:
+        if self._n_trades == 0:
             logger.warning("⚠️  No trades to export")
             return None
 
-        df = pd.DataFrame(self.trade_history)
+        # Values are kept unrounded internally; round for the report only
+        df = self.trades_frame().round(
+            {'pnl': 2, 'pnl_percent': 2, 'equity_after': 2}
+        )
         output_path = f"results/{filename}"
         df.to_csv(output_path, index=False)
         logger.info(f"💾 Trade log exported to {output_path}")
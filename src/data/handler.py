@@ -9,16 +9,21 @@ Version: 1.0.0
 
 import os
 import json
+import asyncio
+import hashlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 import ccxt
+import ccxt.async_support as ccxt_async
 from utils.config import Config
 import logging
 from pathlib import Path
 
+from utils._njit import njit, NUMBA_AVAILABLE
+
 # Setup logging
 logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL),
@@ -27,12 +32,50 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _ohlcv_rows_valid(open_, high, low, close, volume):
+    """
+    Single pass over OHLCV rows that stops at the first invalid one
+    (compiled when numba is installed)
+    
+    Returns:
+        bool: True if every row is finite, positive and OHLC-consistent
+    """
+    for i in range(open_.shape[0]):
+        if not (np.isfinite(open_[i]) and np.isfinite(high[i])
+                and np.isfinite(low[i]) and np.isfinite(close[i])
+                and np.isfinite(volume[i])):
+            return False
+        if not (open_[i] > 0 and high[i] > 0
+                and low[i] > 0 and close[i] > 0):
+            return False
+        if not (high[i] >= low[i] and high[i] >= open_[i]
+                and high[i] >= close[i]
+                and low[i] <= open_[i] and low[i] <= close[i]):
+            return False
+    return True
+
+
 class DataHandler:
     """
     Manages market data retrieval, caching, and preprocessing.
     Supports both Binance official API and CCXT for multi-exchange compatibility.
     """
     
+    # Timeframe -> python-binance kline interval
+    _INTERVAL_MAP = {
+        '1m': Client.KLINE_INTERVAL_1MINUTE,
+        '5m': Client.KLINE_INTERVAL_5MINUTE,
+        '15m': Client.KLINE_INTERVAL_15MINUTE,
+        '1h': Client.KLINE_INTERVAL_1HOUR,
+        '4h': Client.KLINE_INTERVAL_4HOUR,
+        '1d': Client.KLINE_INTERVAL_1DAY
+    }
+    
+    # CCXT OHLCV pages in flight at once; the client's rate limiter spaces
+    # the requests themselves
+    _CCXT_MAX_CONCURRENT_PAGES = 4
+    
     def __init__(self, use_ccxt=False):
         """
         Initialize data handler with API clients.
@@ -65,9 +108,9 @@ class DataHandler:
             logger.warning("⚠️  Using Binance MAINNET - Real funds at risk!")
         return client
     
-    def _init_ccxt_client(self):
+    def _init_ccxt_client(self, exchange_module=ccxt):
         """Initialize CCXT client for multi-exchange support"""
-        exchange_class = getattr(ccxt, 'binance')
+        exchange_class = getattr(exchange_module, 'binance')
         client = exchange_class({
             'apiKey': Config.BINANCE_API_KEY,
             'secret': Config.BINANCE_API_SECRET,
@@ -81,7 +124,7 @@ class DataHandler:
         return client
     
     def fetch_ohlcv(self, symbol=None, timeframe=None, start_date=None, end_date=None, 
-                     use_cache=True, limit=1000):
+                     use_cache=True, limit=1000, columns=None):
         """
         Fetch OHLCV (Open, High, Low, Close, Volume) data.
         
@@ -92,6 +135,7 @@ class DataHandler:
             end_date (str): End date in 'YYYY-MM-DD' format
             use_cache (bool): Load from cache if available
             limit (int): Maximum number of candles to fetch
+            columns (list): Subset of OHLCV columns to return (default: all)
             
         Returns:
             pd.DataFrame: OHLCV data with columns [timestamp, open, high, low, close, volume]
@@ -103,25 +147,43 @@ class DataHandler:
         
         # Check cache
         cache_file = self._get_cache_filename(symbol, timeframe, start_date, end_date)
+        if use_cache and not cache_file.exists():
+            self._migrate_csv_cache(symbol, timeframe, start_date, end_date, cache_file)
         if use_cache and cache_file.exists():
             logger.info(f"📦 Loading data from cache: {cache_file.name}")
-            return pd.read_csv(cache_file, index_col=0, parse_dates=True)
+            # Parquet restores the datetime index and only reads requested columns
+            return pd.read_parquet(cache_file, engine='pyarrow',
+                                   columns=None if columns is None else list(columns))
+        
+        # A cached earlier request from the same start only needs its tail
+        # fetched; the last cached candle is re-fetched as it may have been open
+        cached = None
+        fetch_start = start_date
+        if use_cache:
+            cached = self._load_cached_prefix(symbol, timeframe, start_date, end_date)
+        if cached is not None:
+            fetch_start = str(cached.index[-1])
+            logger.info(f"📦 Extending {len(cached)} cached candles from {fetch_start}")
         
-        logger.info(f"🔍 Fetching {symbol} {timeframe} data from {start_date} to {end_date}")
+        logger.info(f"🔍 Fetching {symbol} {timeframe} data from {fetch_start} to {end_date}")
         
         try:
             if self.use_ccxt:
-                df = self._fetch_ccxt(symbol, timeframe, start_date, end_date, limit)
+                df = self._fetch_ccxt(symbol, timeframe, fetch_start, end_date, limit)
             else:
-                df = self._fetch_binance(symbol, timeframe, start_date, end_date, limit)
+                df = self._fetch_binance(symbol, timeframe, fetch_start, end_date, limit)
+            
+            if cached is not None:
+                df = pd.concat([cached.iloc[:-1], df])
+                df = df[~df.index.duplicated(keep='last')]
             
             # Save to cache
             if use_cache:
-                df.to_csv(cache_file)
+                df.to_parquet(cache_file, engine='pyarrow', compression='zstd')
                 logger.info(f"💾 Data cached to {cache_file.name}")
             
             logger.info(f"✅ Fetched {len(df)} candles")
-            return df
+            return df if columns is None else df[list(columns)]
             
         except Exception as e:
             logger.error(f"❌ Error fetching data: {e}")
@@ -129,58 +191,93 @@ class DataHandler:
     
     def _fetch_binance(self, symbol, timeframe, start_date, end_date, limit):
         """Fetch data using Binance official API"""
-        interval_map = {
-            '1m': Client.KLINE_INTERVAL_1MINUTE,
-            '5m': Client.KLINE_INTERVAL_5MINUTE,
-            '15m': Client.KLINE_INTERVAL_15MINUTE,
-            '1h': Client.KLINE_INTERVAL_1HOUR,
-            '4h': Client.KLINE_INTERVAL_4HOUR,
-            '1d': Client.KLINE_INTERVAL_1DAY
-        }
-        
         klines = self.client.get_historical_klines(
             symbol,
-            interval_map[timeframe],
+            self._INTERVAL_MAP[timeframe],
             start_date,
             end_date,
             limit=limit
         )
         
-        # Convert to DataFrame
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-        
-        # Clean and format
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
-        df = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+        # Parse only timestamp + OHLCV (fields 0-5 of 12) straight into typed arrays
+        n = len(klines)
+        values = np.fromiter(
+            (float(kline[i]) for kline in klines for i in (1, 2, 3, 4, 5)),
+            dtype=np.float64, count=n * 5
+        ).reshape(-1, 5)
+        ts = np.fromiter((kline[0] for kline in klines), dtype=np.int64, count=n)
         
-        return df
+        index = pd.DatetimeIndex(pd.to_datetime(ts, unit='ms'), name='timestamp')
+        return pd.DataFrame(values, columns=['open', 'high', 'low', 'close', 'volume'], index=index)
     
     def _fetch_ccxt(self, symbol, timeframe, start_date, end_date, limit):
-        """Fetch data using CCXT"""
+        """Fetch data using CCXT, requesting a few pages concurrently"""
         since = int(pd.Timestamp(start_date).timestamp() * 1000)
         until = int(pd.Timestamp(end_date).timestamp() * 1000)
         
-        all_ohlcv = []
-        current = since
+        # Page boundaries are known up front, so pages don't depend on each other
+        limit = min(limit, 1000)
+        step = limit * ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        starts = list(range(since, until, step))
+        pages = asyncio.run(self._fetch_ccxt_pages(symbol, timeframe, starts, limit))
         
-        while current < until:
-            ohlcv = self.client.fetch_ohlcv(symbol, timeframe, since=current, limit=limit)
-            if not ohlcv:
-                break
-            all_ohlcv.extend(ohlcv)
-            current = ohlcv[-1][0] + 1
+        # Copy each page into one pre-sized [timestamp, o, h, l, c, v] buffer
+        buf = np.empty((sum(len(page) for page in pages), 6), dtype=np.float64)
+        offset = 0
+        for page in pages:
+            if page:
+                buf[offset:offset + len(page)] = np.asarray(page, dtype=np.float64)
+                offset += len(page)
         
         # Convert to DataFrame
-        df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        index = pd.DatetimeIndex(pd.to_datetime(buf[:, 0].astype(np.int64), unit='ms'), name='timestamp')
+        df = pd.DataFrame(buf[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'], index=index)
+        df = df[~df.index.duplicated()].sort_index()
         
-        return df
+        # The last page may run past end_date
+        return self.slice_by_date(df, start_date, end_date)
+    
+    async def _fetch_ccxt_pages(self, symbol, timeframe, starts, limit):
+        """
+        Fetch one OHLCV page per start timestamp with the async CCXT client,
+        at most _CCXT_MAX_CONCURRENT_PAGES at a time. The client is
+        rate-limited and always closed, also when a page fails.
+        """
+        client = self._init_ccxt_client(ccxt_async)
+        try:
+            semaphore = asyncio.Semaphore(self._CCXT_MAX_CONCURRENT_PAGES)
+            
+            async def fetch_page(start):
+                async with semaphore:
+                    return await client.fetch_ohlcv(symbol, timeframe, since=start, limit=limit)
+            
+            return await asyncio.gather(*[fetch_page(start) for start in starts])
+        finally:
+            await client.close()
+    
+    @staticmethod
+    def slice_by_date(df, start_date=None, end_date=None):
+        """
+        Slice time-sorted data to [start_date, end_date] by position.
+        
+        Uses binary search on the raw datetime64 index values instead of
+        label-based ``df.loc[start:end]`` lookups, and returns an
+        ``iloc`` slice of the original frame.
+        
+        Args:
+            df (pd.DataFrame): Data indexed by ascending timestamp
+            start_date (str): Inclusive start timestamp (None = from first row)
+            end_date (str): Inclusive end timestamp (None = up to last row)
+            
+        Returns:
+            pd.DataFrame: Rows inside the date window
+        """
+        ts = df.index.values
+        i0 = 0 if start_date is None else np.searchsorted(
+            ts, np.datetime64(pd.Timestamp(start_date)).astype(ts.dtype), side='left')
+        i1 = len(ts) if end_date is None else np.searchsorted(
+            ts, np.datetime64(pd.Timestamp(end_date)).astype(ts.dtype), side='right')
+        return df.iloc[i0:i1]
     
     def fetch_latest_price(self, symbol=None):
         """
@@ -205,6 +302,28 @@ class DataHandler:
             logger.error(f"❌ Error fetching latest price: {e}")
             raise
     
+    def fetch_latest_prices(self, symbols):
+        """
+        Fetch latest prices for several symbols in one request.
+        
+        Args:
+            symbols (list): Trading pairs
+            
+        Returns:
+            dict: Symbol -> latest price
+        """
+        try:
+            if self.use_ccxt:
+                tickers = self.client.fetch_tickers(symbols)
+                return {symbol: tickers[symbol]['last'] for symbol in symbols if symbol in tickers}
+            else:
+                # Multi-symbol form of the ticker endpoint: symbols=["A","B"]
+                tickers = self.client.get_symbol_ticker(symbols=json.dumps(symbols, separators=(',', ':')))
+                return {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+        except Exception as e:
+            logger.error(f"❌ Error fetching latest prices: {e}")
+            raise
+    
     def get_account_balance(self):
         """
         Fetch account balance.
@@ -218,17 +337,81 @@ class DataHandler:
                 return balance
             else:
                 account = self.client.get_account()
-                balances = {item['asset']: float(item['free']) for item in account['balances'] if float(item['free']) > 0}
-                return balances
+                if not account['balances']:
+                    return {}
+                # Parse all 'free' strings in one pass, then keep non-zero assets
+                bals = pd.DataFrame(account['balances'], columns=['asset', 'free'])
+                free = pd.to_numeric(bals['free']).to_numpy()
+                mask = free > 0
+                return dict(zip(bals['asset'].to_numpy()[mask], free[mask].tolist()))
         except Exception as e:
             logger.error(f"❌ Error fetching balance: {e}")
             return {}
     
     def _get_cache_filename(self, symbol, timeframe, start_date, end_date):
-        """Generate cache filename"""
-        filename = f"{symbol}_{timeframe}_{start_date}_{end_date}.csv"
+        """Generate cache filename keyed by a short hash of the request"""
+        key = f"{symbol}|{timeframe}|{start_date}|{end_date}".encode()
+        digest = hashlib.blake2b(key, digest_size=8).hexdigest()
+        # CCXT symbols look like 'BTC/USDT'; keep them from creating subdirectories
+        filename = f"{symbol.replace('/', '_')}_{timeframe}_{digest}.parquet"
         return self.cache_dir / filename
     
+    def _load_cached_prefix(self, symbol, timeframe, start_date, end_date):
+        """
+        Candles cached by an earlier request for this symbol and timeframe
+        that began at start_date, cut to end_date. Of several such files the
+        one reaching furthest is used.
+        
+        Returns:
+            pd.DataFrame: Cached candles, or None if no cache file fits
+        """
+        start = pd.Timestamp(start_date)
+        bar = pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(timeframe))
+        best, best_end = None, None
+        for path in self.cache_dir.glob(f"{symbol.replace('/', '_')}_{timeframe}_*.parquet"):
+            # Only the index is read to check the covered range
+            try:
+                index = pd.read_parquet(path, engine='pyarrow', columns=[]).index
+            except Exception as e:
+                logger.warning(f"⚠️  Skipping unreadable cache file {path.name}: {e}")
+                continue
+            if len(index) == 0 or not start <= index[0] < start + bar:
+                continue
+            if best_end is None or index[-1] > best_end:
+                best, best_end = path, index[-1]
+        
+        if best is None:
+            return None
+        df = self.slice_by_date(pd.read_parquet(best, engine='pyarrow'), start_date, end_date)
+        return df if len(df) else None
+    
+    def _migrate_csv_cache(self, symbol, timeframe, start_date, end_date, cache_file):
+        """Convert a pre-Parquet CSV cache file for this request, if one exists"""
+        csv_file = self.cache_dir / f"{symbol}_{timeframe}_{start_date}_{end_date}.csv"
+        if not csv_file.exists():
+            return
+        
+        # Only the OHLCV columns are kept, with their types given up front
+        ohlcv = ['open', 'high', 'low', 'close', 'volume']
+        try:
+            import pyarrow.csv as pacsv
+            # Multi-threaded C++ parser
+            column_types = {'timestamp': 'timestamp[ns]'}
+            column_types.update({col: 'float64' for col in ohlcv})
+            convert_options = pacsv.ConvertOptions(
+                column_types=column_types, include_columns=['timestamp'] + ohlcv
+            )
+            table = pacsv.read_csv(csv_file, convert_options=convert_options)
+            df = table.to_pandas(self_destruct=True).set_index('timestamp')
+        except ImportError:
+            df = pd.read_csv(
+                csv_file, usecols=['timestamp'] + ohlcv, index_col='timestamp',
+                dtype=dict.fromkeys(ohlcv, 'float64'), parse_dates=['timestamp']
+            )
+        
+        df.to_parquet(cache_file, engine='pyarrow', compression='zstd')
+        logger.info(f"📦 Migrated CSV cache {csv_file.name} -> {cache_file.name}")
+    
     def validate_data(self, df):
         """
         Validate OHLCV data integrity.
@@ -239,17 +422,28 @@ class DataHandler:
         Returns:
             bool: True if valid
         """
-        checks = {
-            'not_empty': len(df) > 0,
-            'no_nulls': not df.isnull().any().any(),
-            'positive_prices': (df[['open', 'high', 'low', 'close']] > 0).all().all(),
-            'high_low_valid': (df['high'] >= df['low']).all(),
-            'ohlc_valid': ((df['high'] >= df['open']) & (df['high'] >= df['close']) &
-                           (df['low'] <= df['open']) & (df['low'] <= df['close'])).all()
-        }
+        if len(df) == 0:
+            logger.error("❌ Data validation failed: not_empty")
+            return False
+        
+        # One (n, 5) float array; checks run lazily and stop at the first failure
+        a = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64, copy=False)
+        open_, high, low, close = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+        
+        # Compiled fast path; the NumPy checks below only run to name a failure
+        if NUMBA_AVAILABLE and _ohlcv_rows_valid(open_, high, low, close, a[:, 4]):
+            logger.info("✅ Data validation passed")
+            return True
+        
+        checks = (
+            ('no_nulls', lambda: np.isfinite(a).all()),
+            ('positive_prices', lambda: (a[:, :4] > 0).all()),
+            ('high_low_valid', lambda: (high >= low).all()),
+            ('ohlc_valid', lambda: ((high >= open_) & (high >= close) & (low <= open_) & (low <= close)).all())
+        )
         
-        for check_name, passed in checks.items():
-            if not passed:
+        for check_name, passed in checks:
+            if not passed():
                 logger.error(f"❌ Data validation failed: {check_name}")
                 return False
         
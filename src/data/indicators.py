@@ -10,12 +10,155 @@ Version: 1.0.0
 import pandas as pd
 import pandas_ta as ta
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from utils.config import Config
 import logging
 
+# TA-Lib's C kernels are used when installed; pandas_ta is the fallback
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _ema_rsi_atr_kernel(close, high, low, fast, slow, rsi_period, atr_period):
+    """
+    EMA fast/slow, Wilder RSI and Wilder ATR in one pass over the bars
+    (compiled when numba is installed).
+
+    Seeding follows TA-Lib: EMAs start from an SMA, RSI and ATR from the
+    mean of their first ``period`` gains/losses and true ranges.
+
+    Returns:
+        tuple: (ema_fast, ema_slow, rsi, atr) float64 arrays, NaN during warm-up
+    """
+    n = close.shape[0]
+    ema_f = np.full(n, np.nan)
+    ema_s = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    atr = np.full(n, np.nan)
+
+    k_f = 2.0 / (fast + 1)
+    k_s = 2.0 / (slow + 1)
+    sum_f = 0.0
+    sum_s = 0.0
+    gain = 0.0
+    loss = 0.0
+    tr_avg = 0.0
+
+    for i in range(n):
+        c = close[i]
+
+        # EMAs
+        if i < fast:
+            sum_f += c
+            if i == fast - 1:
+                ema_f[i] = sum_f / fast
+        else:
+            ema_f[i] = ema_f[i - 1] + k_f * (c - ema_f[i - 1])
+        if i < slow:
+            sum_s += c
+            if i == slow - 1:
+                ema_s[i] = sum_s / slow
+        else:
+            ema_s[i] = ema_s[i - 1] + k_s * (c - ema_s[i - 1])
+
+        if i == 0:
+            continue
+        prev = close[i - 1]
+
+        # RSI
+        change = c - prev
+        up = change if change > 0 else 0.0
+        down = -change if change < 0 else 0.0
+        if i <= rsi_period:
+            gain += up
+            loss += down
+            if i == rsi_period:
+                gain /= rsi_period
+                loss /= rsi_period
+        else:
+            gain = (gain * (rsi_period - 1) + up) / rsi_period
+            loss = (loss * (rsi_period - 1) + down) / rsi_period
+        if i >= rsi_period:
+            total = gain + loss
+            rsi[i] = 100.0 * gain / total if total != 0 else 0.0
+
+        # ATR
+        tr = max(high[i] - low[i], abs(high[i] - prev), abs(low[i] - prev))
+        if i <= atr_period:
+            tr_avg += tr
+            if i == atr_period:
+                tr_avg /= atr_period
+                atr[i] = tr_avg
+        else:
+            tr_avg = (tr_avg * (atr_period - 1) + tr) / atr_period
+            atr[i] = tr_avg
+
+    return ema_f, ema_s, rsi, atr
+
+
+@njit(cache=True)
+def _donchian_kernel(high, low, period):
+    """
+    Rolling max of highs / min of lows with monotonic index deques
+    (Lemire), O(n) regardless of the window length.
+
+    Each index enters and leaves a deque once, so both deques live in
+    plain arrays with head/tail cursors.
+
+    Returns:
+        tuple: (upper, lower, mid) float64 arrays, NaN for the first
+        ``period - 1`` bars
+    """
+    n = high.shape[0]
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    max_idx = np.empty(n, dtype=np.int64)
+    min_idx = np.empty(n, dtype=np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+    # Like pandas rolling(period), a window holding a NaN yields NaN
+    last_nan_high = last_nan_low = -period
+
+    for i in range(n):
+        # Drop candidates the new bar dominates, then append it
+        if np.isnan(high[i]):
+            last_nan_high = i
+        else:
+            while max_tail > max_head and high[max_idx[max_tail - 1]] <= high[i]:
+                max_tail -= 1
+            max_idx[max_tail] = i
+            max_tail += 1
+        if np.isnan(low[i]):
+            last_nan_low = i
+        else:
+            while min_tail > min_head and low[min_idx[min_tail - 1]] >= low[i]:
+                min_tail -= 1
+            min_idx[min_tail] = i
+            min_tail += 1
+
+        # Expire the front once it falls out of the window
+        if max_tail > max_head and max_idx[max_head] <= i - period:
+            max_head += 1
+        if min_tail > min_head and min_idx[min_head] <= i - period:
+            min_head += 1
+
+        if i >= period - 1:
+            if i - last_nan_high >= period:
+                upper[i] = high[max_idx[max_head]]
+            if i - last_nan_low >= period:
+                lower[i] = low[min_idx[min_head]]
+
+    return upper, lower, 0.5 * (upper + lower)
+
+
 class TechnicalIndicators:
     """
     Technical indicator calculator for trading strategies.
@@ -33,6 +176,12 @@ class TechnicalIndicators:
         self.df = df.copy()
         self.validate_input()
 
+        # Contiguous float64 views of the price columns, shared by all kernels
+        self._close = np.ascontiguousarray(self.df['close'].to_numpy(), dtype=np.float64)
+        self._high = np.ascontiguousarray(self.df['high'].to_numpy(), dtype=np.float64)
+        self._low = np.ascontiguousarray(self.df['low'].to_numpy(), dtype=np.float64)
+        self._volume = np.ascontiguousarray(self.df['volume'].to_numpy(), dtype=np.float64)
+
     def validate_input(self):
         """Ensure DataFrame has required columns"""
         required = ['open', 'high', 'low', 'close', 'volume']
@@ -49,15 +198,20 @@ class TechnicalIndicators:
         """
         logger.info("🔧 Calculating technical indicators...")
 
-        # Trend indicators
-        self.add_ema()
+        if NUMBA_AVAILABLE:
+            # Trend, momentum and volatility from one compiled pass
+            self.add_ema_rsi_atr()
+            self.add_adx()
+        else:
+            # Trend indicators
+            self.add_ema()
 
-        # Momentum indicators
-        self.add_rsi()
-        self.add_adx()
+            # Momentum indicators
+            self.add_rsi()
+            self.add_adx()
 
-        # Volatility indicators
-        self.add_atr()
+            # Volatility indicators
+            self.add_atr()
 
         # Breakout indicators
         self.add_donchian_channel()
@@ -75,38 +229,71 @@ class TechnicalIndicators:
 
     def add_ema(self):
         """Add Exponential Moving Averages (EMA)"""
-        self.df['ema_fast'] = ta.ema(
-            self.df['close'],
-            length=Config.EMA_FAST
-        )
-        self.df['ema_slow'] = ta.ema(
-            self.df['close'],
-            length=Config.EMA_SLOW
-        )
+        if TALIB_AVAILABLE:
+            self.df['ema_fast'] = talib.EMA(self._close, timeperiod=Config.EMA_FAST)
+            self.df['ema_slow'] = talib.EMA(self._close, timeperiod=Config.EMA_SLOW)
+        else:
+            self.df['ema_fast'] = ta.ema(
+                self.df['close'],
+                length=Config.EMA_FAST
+            )
+            self.df['ema_slow'] = ta.ema(
+                self.df['close'],
+                length=Config.EMA_SLOW
+            )
         logger.debug(
             f"Added EMA: fast={Config.EMA_FAST}, slow={Config.EMA_SLOW}"
         )
 
     def add_rsi(self):
         """Add Relative Strength Index (RSI)"""
-        self.df['rsi'] = ta.rsi(
-            self.df['close'],
-            length=Config.RSI_PERIOD
-        )
+        if TALIB_AVAILABLE:
+            self.df['rsi'] = talib.RSI(self._close, timeperiod=Config.RSI_PERIOD)
+        else:
+            self.df['rsi'] = ta.rsi(
+                self.df['close'],
+                length=Config.RSI_PERIOD
+            )
         logger.debug(f"Added RSI with period={Config.RSI_PERIOD}")
 
     def add_atr(self):
         """Add Average True Range (ATR) for volatility measurement"""
-        self.df['atr'] = ta.atr(
-            self.df['high'],
-            self.df['low'],
-            self.df['close'],
-            length=Config.ATR_PERIOD
-        )
+        if TALIB_AVAILABLE:
+            self.df['atr'] = talib.ATR(
+                self._high, self._low, self._close, timeperiod=Config.ATR_PERIOD
+            )
+        else:
+            self.df['atr'] = ta.atr(
+                self.df['high'],
+                self.df['low'],
+                self.df['close'],
+                length=Config.ATR_PERIOD
+            )
         logger.debug(f"Added ATR with period={Config.ATR_PERIOD}")
 
+    def add_ema_rsi_atr(self):
+        """Add EMA fast/slow, RSI and ATR with the fused single-pass kernel"""
+        ema_fast, ema_slow, rsi, atr = _ema_rsi_atr_kernel(
+            self._close, self._high, self._low,
+            Config.EMA_FAST, Config.EMA_SLOW, Config.RSI_PERIOD, Config.ATR_PERIOD
+        )
+        self.df['ema_fast'] = ema_fast
+        self.df['ema_slow'] = ema_slow
+        self.df['rsi'] = rsi
+        self.df['atr'] = atr
+        logger.debug("Added EMA, RSI and ATR (fused kernel)")
+
     def add_adx(self):
         """Add Average Directional Index (ADX) for trend strength"""
+        if TALIB_AVAILABLE:
+            high, low, close = self._high, self._low, self._close
+            period = Config.ADX_PERIOD
+            self.df['adx'] = talib.ADX(high, low, close, timeperiod=period)
+            self.df['di_plus'] = talib.PLUS_DI(high, low, close, timeperiod=period)
+            self.df['di_minus'] = talib.MINUS_DI(high, low, close, timeperiod=period)
+            logger.debug(f"Added ADX with period={period}")
+            return
+
         adx_df = ta.adx(
             self.df['high'],
             self.df['low'],
@@ -127,6 +314,18 @@ class TechnicalIndicators:
 
     def add_donchian_channel(self):
         """Add Donchian Channel for breakout detection"""
+        if NUMBA_AVAILABLE:
+            upper, lower, mid = _donchian_kernel(
+                self._high, self._low, Config.DONCHIAN_PERIOD
+            )
+            self.df['donchian_upper'] = upper
+            self.df['donchian_lower'] = lower
+            self.df['donchian_mid'] = mid
+            logger.debug(
+                f"Added Donchian Channel with period={Config.DONCHIAN_PERIOD}"
+            )
+            return
+
         donchian = ta.donchian(
             self.df['high'],
             self.df['low'],
@@ -146,15 +345,15 @@ class TechnicalIndicators:
             ]
         else:
             period = Config.DONCHIAN_PERIOD
-            self.df['donchian_upper'] = self.df['high'].rolling(
-                window=period
-            ).max()
-            self.df['donchian_lower'] = self.df['low'].rolling(
-                window=period
-            ).min()
-            self.df['donchian_mid'] = (
-                self.df['donchian_upper'] + self.df['donchian_lower']
-            ) / 2
+            upper = np.full_like(self._high, np.nan)
+            lower = np.full_like(self._low, np.nan)
+            if len(self._high) >= period:
+                # (n - period + 1, period) strided views, reduced in one call each
+                upper[period - 1:] = sliding_window_view(self._high, period).max(axis=1)
+                lower[period - 1:] = sliding_window_view(self._low, period).min(axis=1)
+            self.df['donchian_upper'] = upper
+            self.df['donchian_lower'] = lower
+            self.df['donchian_mid'] = 0.5 * (upper + lower)
 
         logger.debug(
             f"Added Donchian Channel with period={Config.DONCHIAN_PERIOD}"
@@ -166,21 +365,16 @@ class TechnicalIndicators:
         Long: EMA fast > EMA slow AND ADX > threshold
         Short: EMA fast < EMA slow AND ADX > threshold
         """
-        self.df['trend_signal'] = 0
-
-        # Long condition
-        long_cond = (
-            (self.df['ema_fast'] > self.df['ema_slow']) &
-            (self.df['adx'] > Config.ADX_THRESHOLD)
-        )
-        self.df.loc[long_cond, 'trend_signal'] = 1
+        ema_fast = self.df['ema_fast'].to_numpy()
+        ema_slow = self.df['ema_slow'].to_numpy()
+        trending = self.df['adx'].to_numpy() > Config.ADX_THRESHOLD
 
-        # Short condition
-        short_cond = (
-            (self.df['ema_fast'] < self.df['ema_slow']) &
-            (self.df['adx'] > Config.ADX_THRESHOLD)
-        )
-        self.df.loc[short_cond, 'trend_signal'] = -1
+        # NaN warm-up values compare False, so they stay neutral
+        self.df['trend_signal'] = np.select(
+            [trending & (ema_fast > ema_slow), trending & (ema_fast < ema_slow)],
+            [1, -1],
+            default=0
+        ).astype(np.int8)
 
         logger.debug("Added trend signal (EMA crossover + ADX filter)")
 
@@ -190,19 +384,16 @@ class TechnicalIndicators:
         Long: Close breaks above upper band
         Short: Close breaks below lower band
         """
-        self.df['breakout_signal'] = 0
+        close = self._close
+        prev_upper = self.df['donchian_upper'].shift(1).to_numpy()
+        prev_lower = self.df['donchian_lower'].shift(1).to_numpy()
 
-        # Long breakout
-        long_breakout = (
-            self.df['close'] > self.df['donchian_upper'].shift(1)
-        )
-        self.df.loc[long_breakout, 'breakout_signal'] = 1
-
-        # Short breakout
-        short_breakout = (
-            self.df['close'] < self.df['donchian_lower'].shift(1)
-        )
-        self.df.loc[short_breakout, 'breakout_signal'] = -1
+        # Short breakout is checked first, matching the old overwrite order
+        self.df['breakout_signal'] = np.select(
+            [close < prev_lower, close > prev_upper],
+            [-1, 1],
+            default=0
+        ).astype(np.int8)
 
         logger.debug("Added breakout signal (Donchian Channel)")
 
@@ -212,15 +403,14 @@ class TechnicalIndicators:
         Long: RSI < oversold (price may bounce up)
         Short: RSI > overbought (price may pull back)
         """
-        self.df['pullback_signal'] = 0
-
-        # Oversold - potential long
-        oversold = self.df['rsi'] < Config.RSI_OVERSOLD
-        self.df.loc[oversold, 'pullback_signal'] = 1
+        rsi = self.df['rsi'].to_numpy()
 
-        # Overbought - potential short
-        overbought = self.df['rsi'] > Config.RSI_OVERBOUGHT
-        self.df.loc[overbought, 'pullback_signal'] = -1
+        # Oversold -> potential long, overbought -> potential short
+        self.df['pullback_signal'] = np.select(
+            [rsi > Config.RSI_OVERBOUGHT, rsi < Config.RSI_OVERSOLD],
+            [-1, 1],
+            default=0
+        ).astype(np.int8)
 
         logger.debug("Added pullback signal (RSI extremes)")
 
@@ -229,11 +419,12 @@ class TechnicalIndicators:
         Combine all three signals into a unified score.
         Score ranges from -3 (strong short) to +3 (strong long).
         """
+        # Inputs are int8 in {-1, 0, 1}, so the int8 sum cannot overflow
         self.df['combined_signal'] = (
-            self.df['trend_signal'] +
-            self.df['breakout_signal'] +
-            self.df['pullback_signal']
-        )
+            self.df['trend_signal'].to_numpy() +
+            self.df['breakout_signal'].to_numpy() +
+            self.df['pullback_signal'].to_numpy()
+        ).astype(np.int8, copy=False)
 
         logger.debug("Added combined signal (sum of all strategies)")
 
@@ -259,13 +450,47 @@ class TechnicalIndicators:
             'combined_signal': int(latest['combined_signal'])
         }
 
-    def export_to_csv(self, filename='indicators_output.csv'):
-        """Export calculated indicators to CSV"""
+    def export(self, filename='indicators_output.parquet', fmt='parquet'):
+        """
+        Export calculated indicators to results/.
+
+        Args:
+            filename (str): Output file name
+            fmt (str): 'parquet' (zstd-compressed, default) or 'csv'
+
+        Returns:
+            str: Path of the written file
+        """
         output_path = f"results/{filename}"
-        self.df.to_csv(output_path)
+        if fmt == 'parquet':
+            self.df.to_parquet(output_path, engine='pyarrow', compression='zstd')
+        elif fmt == 'csv':
+            # Written in chunks so large frames are not formatted in one go
+            self.df.to_csv(output_path, chunksize=50_000)
+        else:
+            raise ValueError(f"Unsupported export format: {fmt}")
         logger.info(f"💾 Indicators exported to {output_path}")
         return output_path
 
+    def export_to_csv(self, filename='indicators_output.csv'):
+        """Export calculated indicators to CSV"""
+        return self.export(filename, fmt='csv')
+
+    @classmethod
+    def warm_up_kernels(cls):
+        """
+        Compile (or load from numba's on-disk cache) the indicator kernels on
+        dummy bars, so the first real tick doesn't pay for it
+        """
+        if NUMBA_AVAILABLE:
+            bars = np.linspace(100.0, 101.0, 64)
+            warm = cls(pd.DataFrame({
+                'open': bars, 'high': bars + 1.0, 'low': bars - 1.0,
+                'close': bars, 'volume': np.ones(64)
+            }))
+            warm.add_ema_rsi_atr()
+            warm.add_donchian_channel()
+
 
 if __name__ == "__main__":
     # Test indicators
@@ -0,0 +1,165 @@
+"""
+BiX TradeBOT - Chart Utilities
+===============================
+Helpers that build Plotly traces for large charts.
+
+Author: SALMAN ThinkTank AI Core
+Version: 1.0.0
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Re-exported: the downsampling helpers live in utils so non-UI code can use
+# them without importing the UI package
+from utils.downsample import MAX_CHART_POINTS, downsample_ohlcv, lttb  # noqa: F401
+
+# From this many candles on, draw with WebGL instead of SVG
+WEBGL_THRESHOLD = 600
+
+
+def _segments(x, start, end):
+    """Interleave (x, start) -> (x, end) segments separated by NaN gaps"""
+    n = len(x)
+    seg_x = np.repeat(x, 3)
+    seg_y = np.empty(3 * n, dtype=np.float32)
+    seg_y[0::3] = start
+    seg_y[1::3] = end
+    seg_y[2::3] = np.nan
+    return seg_x, seg_y
+
+
+def _plot_arrays(df):
+    """
+    Millisecond timestamps and float32 OHLC arrays for Plotly.
+
+    Plotly ships numpy arrays to the browser as typed arrays, so float32
+    halves the payload versus float64 with no visible loss at chart scale.
+    """
+    x = df.index.values.astype('datetime64[ms]')
+    return x, tuple(df[col].to_numpy(dtype=np.float32)
+                    for col in ('open', 'high', 'low', 'close'))
+
+
+def candlestick_traces(df, name='Price'):
+    """
+    Build the price traces for a candle chart.
+
+    Small frames use ``go.Candlestick``. Large frames are drawn with
+    ``go.Scattergl`` so the browser renders on the GPU: one trace for
+    all wicks and one trace each for rising and falling bodies, every
+    candle being a NaN-separated line segment.
+
+    Args:
+        df (pd.DataFrame): Data with open, high, low, close columns
+        name (str): Legend name of the price series
+
+    Returns:
+        list: Plotly traces to add to the price row
+    """
+    x, (open_, high, low, close) = _plot_arrays(df)
+
+    if len(df) < WEBGL_THRESHOLD:
+        return [go.Candlestick(
+            x=x,
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            name=name
+        )]
+
+    rising = close >= open_
+
+    wick_x, wick_y = _segments(x, low, high)
+    traces = [go.Scattergl(
+        x=wick_x, y=wick_y,
+        mode='lines',
+        line=dict(color='gray', width=1),
+        name=name,
+        legendgroup=name,
+        hoverinfo='skip'
+    )]
+
+    for mask, color in ((rising, 'green'), (~rising, 'red')):
+        body_x, body_y = _segments(x[mask], open_[mask], close[mask])
+        traces.append(go.Scattergl(
+            x=body_x, y=body_y,
+            mode='lines',
+            line=dict(color=color, width=4),
+            name=name,
+            legendgroup=name,
+            showlegend=False
+        ))
+
+    return traces
+
+
+def volume_bar(df, name='Volume'):
+    """
+    Volume bars colored green/red by candle direction.
+
+    Colors are given as a 0/1 array mapped through a two-color scale, so
+    Plotly validates one numeric array instead of one color string per bar.
+
+    Args:
+        df (pd.DataFrame): Data with open, close, volume columns
+        name (str): Legend name of the volume series
+
+    Returns:
+        go.Bar: Volume trace
+    """
+    rising = (df['close'].to_numpy() >= df['open'].to_numpy()).astype(np.int8)
+    return go.Bar(
+        x=df.index.values.astype('datetime64[ms]'),
+        y=df['volume'].to_numpy(dtype=np.float32),
+        name=name,
+        marker=dict(
+            color=rising,
+            colorscale=[[0, 'red'], [1, 'green']],
+            cmin=0,
+            cmax=1
+        )
+    )
+
+
+def add_level_lines(fig, levels):
+    """
+    Draw horizontal price levels with a single layout update.
+
+    ``fig.add_hline`` re-validates and re-resolves subplot axes on every
+    call; here all lines and labels are built as plain layout dicts and
+    appended at once.
+
+    Args:
+        fig (go.Figure): Figure to draw on
+        levels (list): Dicts with ``y`` and ``color`` plus optional
+            ``dash``, ``width``, ``text``, ``position`` ('left'/'right')
+            and ``yref`` (axis of the subplot row, default 'y')
+
+    Returns:
+        go.Figure: ``fig`` with the levels added
+    """
+    shapes = list(fig.layout.shapes)
+    annotations = list(fig.layout.annotations)
+
+    for level in levels:
+        yref = level.get('yref', 'y')
+        xref = f"x{yref[1:]} domain"
+        shapes.append(dict(
+            type='line', xref=xref, yref=yref,
+            x0=0, x1=1, y0=level['y'], y1=level['y'],
+            line=dict(color=level['color'], width=level.get('width', 1),
+                      dash=level.get('dash', 'solid'))
+        ))
+        if level.get('text'):
+            right = level.get('position', 'left') == 'right'
+            annotations.append(dict(
+                xref=xref, yref=yref,
+                x=1 if right else 0, y=level['y'],
+                xanchor='right' if right else 'left', yanchor='bottom',
+                text=level['text'], showarrow=False
+            ))
+
+    fig.update_layout(shapes=shapes, annotations=annotations)
+    return fig
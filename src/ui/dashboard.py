@@ -9,6 +9,7 @@ Version: 1.0.0
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
@@ -24,11 +25,7 @@ root_dir = src_dir.parent  # root directory
 sys.path.insert(0, str(src_dir))
 
 from utils.config import Config
-from data.handler import DataHandler
-from data.indicators import TechnicalIndicators
-from core.ml_engine import MLEngine
 from core.risk_manager import RiskManager
-from core.strategy import SimpleHybridStrategy
 from utils.logger import get_logger
 
 # Import backtester (optional - may not exist in all versions)
@@ -88,13 +85,119 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Display labels for signals and predictions
+SIGNAL_COLORS = {'BUY': '🟢', 'SELL': '🔴', 'HOLD': '⚪'}
+SIGNAL_EMOJI = {1: "🟢 Long", -1: "🔴 Short", 0: "⚪ Neutral"}
+PRED_TEXT = {1: "🟢 BULLISH", -1: "🔴 BEARISH", 0: "⚪ NEUTRAL"}
+
+# Candles and columns kept in session state for the price chart
+CHART_BARS = 100
+CHART_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'ema_fast', 'ema_slow', 'rsi']
+
+
+@st.cache_resource
+def _get_handler(testnet):
+    """Shared DataHandler per network so the API client survives reruns"""
+    from data.handler import DataHandler  # ccxt/binance load on first use only
+    return DataHandler(use_ccxt=False)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_ohlcv_cached(symbol, timeframe, limit, testnet):
+    """Fetch OHLCV data, reusing results for 60 seconds across reruns"""
+    return _get_handler(testnet).fetch_ohlcv(symbol=symbol, timeframe=timeframe, limit=limit)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _load_training_ohlcv(symbol, timeframe, limit, use_cache, testnet):
+    """Training candles, reused for 15 minutes across repeated training clicks"""
+    return _get_handler(testnet).fetch_ohlcv(symbol=symbol, timeframe=timeframe,
+                                             limit=limit, use_cache=use_cache)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _compute_indicators(df):
+    """Indicators and latest signals, recomputed only when the candles change"""
+    from data.indicators import TechnicalIndicators  # pandas_ta loads on first use only
+    indicators = TechnicalIndicators(df)
+    return indicators.calculate_all(), indicators.get_latest_signals()
+
+
+@st.cache_resource
+def _get_strategy(use_ml):
+    """Shared (stateless) signal strategy per ML setting"""
+    from core.strategy import SimpleHybridStrategy
+    return SimpleHybridStrategy(use_ml=use_ml)
+
+
+@st.cache_resource
+def _get_ml_engine(timeframe):
+    """
+    Shared ML engine per timeframe so the model loads once, not on every
+    click: the timeframe's own model (trained in Tab 4) if one was saved,
+    else the default model
+    """
+    from core.ml_engine import MLEngine  # LightGBM loads on first use only
+    ml_engine = MLEngine(timeframe=timeframe)
+    if not (ml_engine.booster_path.exists() or ml_engine.model_path.exists()):
+        ml_engine = MLEngine()
+    ml_engine.load_model()
+    return ml_engine
+
+
+def _train_model(symbol, timeframe, training_samples, use_cache):
+    """Fetch candles, compute indicators and train a model (shared by both Tab 4 buttons)"""
+    from core.ml_engine import MLEngine  # LightGBM loads on first use only
+    
+    Config.SYMBOL = symbol
+    Config.TIMEFRAME = timeframe
+    
+    df = _load_training_ohlcv(symbol, timeframe, training_samples,
+                              use_cache, Config.BINANCE_TESTNET)
+    df_indicators, _ = _compute_indicators(df)
+    
+    metrics = MLEngine(timeframe=timeframe).train(df_indicators)
+    
+    # Drop the cached engines so analysis picks up the new model (clearing a
+    # single entry needs a newer Streamlit than requirements.txt pins)
+    _get_ml_engine.clear()
+    return len(df), metrics
+
+
+def _show_training_metrics(metrics):
+    """Show accuracy, split sizes and feature count after training"""
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Accuracy", f"{metrics['accuracy']:.2%}")
+    
+    with col2:
+        st.metric("Training Size", metrics['train_size'])
+    
+    with col3:
+        st.metric("Test Size", metrics['test_size'])
+    
+    with col4:
+        st.metric("Features", metrics['features'])
+
+
+@st.cache_resource
+def _live_feed_worker(top_n):
+    """Shared live feed whose event loop and thread outlive script reruns"""
+    return LiveDataFeed(top_n_coins=top_n, update_interval=5)
+
+
+def _style_movers(df_movers):
+    """Format a top gainers/losers table, shading rows by 24h change"""
+    return df_movers.style.format({
+        'price_usd': '${:,.4f}',
+        '24h_change_percent': '{:+.2f}%'
+    }).background_gradient(subset=['24h_change_percent'], cmap='RdYlGn')
+
+
 # Initialize session state
-if 'data_handler' not in st.session_state:
-    st.session_state.data_handler = None
 if 'latest_data' not in st.session_state:
     st.session_state.latest_data = None
-if 'ml_engine' not in st.session_state:
-    st.session_state.ml_engine = None
 if 'risk_manager' not in st.session_state:
     st.session_state.risk_manager = RiskManager()
 if 'logger' not in st.session_state:
@@ -151,6 +254,7 @@ with st.sidebar:
     
     if st.button("🔄 Refresh Data"):
         st.session_state.latest_data = None
+        _fetch_ohlcv_cached.clear()
         st.rerun()
 
 # Main content
@@ -177,14 +281,6 @@ with tab1:
                     component="ANALYSIS"
                 )
                 
-                # Initialize data handler
-                if st.session_state.data_handler is None:
-                    st.session_state.data_handler = DataHandler(use_ccxt=False)
-                    st.session_state.logger.info(
-                        "DataHandler initialized",
-                        component="SYSTEM"
-                    )
-                
                 # Update config
                 Config.SYMBOL = symbol
                 Config.TIMEFRAME = timeframe
@@ -193,12 +289,8 @@ with tab1:
                 Config.INITIAL_CAPITAL = initial_capital
                 Config.RISK_PER_TRADE = risk_per_trade / 100
                 
-                # Fetch data
-                df = st.session_state.data_handler.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    limit=500
-                )
+                # Fetch data (cached for 60s per symbol/timeframe/network)
+                df = _fetch_ohlcv_cached(symbol, timeframe, 500, use_testnet)
                 
                 # Check if we have data
                 if df is None or len(df) == 0:
@@ -229,9 +321,8 @@ with tab1:
                     component="DATA_HANDLER"
                 )
                 
-                # Calculate indicators
-                indicators = TechnicalIndicators(df)
-                df_indicators = indicators.calculate_all()
+                # Calculate indicators (cached on the candle data)
+                df_indicators, latest_signals = _compute_indicators(df)
                 
                 # Check if indicators calculated successfully
                 if df_indicators is None or len(df_indicators) == 0:
@@ -251,17 +342,13 @@ with tab1:
                     component="INDICATORS"
                 )
                 
-                # Get latest signals
-                latest_signals = indicators.get_latest_signals()
-                
                 # ML prediction
                 ml_pred = None
                 ml_conf = None
                 if enable_ml:
-                    if st.session_state.ml_engine is None:
-                        st.session_state.ml_engine = MLEngine()
+                    ml_engine = _get_ml_engine(timeframe)
                     
-                    if not st.session_state.ml_engine.load_model():
+                    if not ml_engine.is_trained and not ml_engine.load_model():
                         st.session_state.logger.warning(
                             "No trained ML model found",
                             component="ML_ENGINE"
@@ -274,9 +361,8 @@ with tab1:
                         try:
                             # For ML predictions, we need full dataframe
                             # not just last row, to calculate features
-                            predictions = (
-                                st.session_state.ml_engine
-                                .get_prediction_confidence(df_indicators)
+                            predictions = ml_engine.get_prediction_confidence(
+                                df_indicators
                             )
                             
                             if predictions is not None and len(predictions) > 0:
@@ -309,7 +395,7 @@ with tab1:
                             )
                 
                 # Generate signal
-                strategy = SimpleHybridStrategy(use_ml=enable_ml)
+                strategy = _get_strategy(enable_ml)
                 signal = strategy.generate_signal(
                     latest_signals,
                     ml_prediction=ml_pred,
@@ -321,8 +407,9 @@ with tab1:
                     component="STRATEGY"
                 )
                 
+                # Keep only the chart window and the columns it draws
                 st.session_state.latest_data = {
-                    'df': df_indicators,
+                    'df': df_indicators[CHART_COLUMNS].tail(CHART_BARS),
                     'signals': latest_signals,
                     'signal': signal,
                     'ml_pred': ml_pred,
@@ -356,10 +443,9 @@ with tab1:
             st.metric("💰 Current Price", f"${signals['close']:,.2f}")
         
         with col2:
-            signal_colors = {'BUY': '🟢', 'SELL': '🔴', 'HOLD': '⚪'}
             st.metric(
                 "🎯 Signal",
-                f"{signal_colors[signal['action']]} {signal['action']}",
+                f"{SIGNAL_COLORS[signal['action']]} {signal['action']}",
                 delta=None
             )
         
@@ -380,7 +466,7 @@ with tab1:
         with col_left:
             st.markdown("### 📈 Technical Indicators")
             
-            indicators_df = pd.DataFrame({
+            indicators_table = {
                 'Indicator': ['EMA Fast', 'EMA Slow', 'RSI', 'ATR', 'ADX'],
                 'Value': [
                     f"${signals['ema_fast']:,.2f}",
@@ -389,28 +475,25 @@ with tab1:
                     f"${signals['atr']:,.2f}",
                     f"{signals['adx']:.2f}"
                 ]
-            })
-            st.dataframe(indicators_df, use_container_width=True, hide_index=True)
+            }
+            st.dataframe(indicators_table, use_container_width=True, hide_index=True)
             
             st.markdown("### 🎯 Strategy Signals")
-            signal_emoji = {1: "🟢 Long", -1: "🔴 Short", 0: "⚪ Neutral"}
-            signals_df = pd.DataFrame({
+            signals_table = {
                 'Strategy': ['Trend', 'Breakout', 'Pullback', 'Combined'],
                 'Signal': [
-                    signal_emoji[signals['trend_signal']],
-                    signal_emoji[signals['breakout_signal']],
-                    signal_emoji[signals['pullback_signal']],
+                    SIGNAL_EMOJI[signals['trend_signal']],
+                    SIGNAL_EMOJI[signals['breakout_signal']],
+                    SIGNAL_EMOJI[signals['pullback_signal']],
                     f"Score: {signals['combined_signal']}"
                 ]
-            })
-            st.dataframe(signals_df, use_container_width=True, hide_index=True)
+            }
+            st.dataframe(signals_table, use_container_width=True, hide_index=True)
         
         with col_right:
             if data['ml_pred'] is not None:
                 st.markdown("### 🤖 ML Prediction")
-                pred_text = {1: "🟢 BULLISH", -1: "🔴 BEARISH", 0: "⚪ NEUTRAL"}
-                
-                st.markdown(f"**Prediction:** {pred_text.get(data['ml_pred'], 'UNKNOWN')}")
+                st.markdown(f"**Prediction:** {PRED_TEXT.get(data['ml_pred'], 'UNKNOWN')}")
                 st.progress(data['ml_conf'])
                 st.markdown(f"**Confidence:** {data['ml_conf']:.1%}")
             
@@ -426,7 +509,7 @@ with tab1:
                 )
                 
                 st.markdown("### 💼 Position Sizing")
-                pos_df = pd.DataFrame({
+                pos_table = {
                     'Parameter': ['Size', 'Value', 'Stop Loss', 'Take Profit', 'Risk'],
                     'Value': [
                         f"{position_info['size']:.6f}",
@@ -435,14 +518,14 @@ with tab1:
                         f"${position_info['take_profit']:,.2f}",
                         f"${position_info['risk_amount']:,.2f}"
                     ]
-                })
-                st.dataframe(pos_df, use_container_width=True, hide_index=True)
+                }
+                st.dataframe(pos_table, use_container_width=True, hide_index=True)
         
         # Price chart
         st.markdown("---")
         st.markdown("### 📊 Price Chart")
         
-        df_chart = data['df'].tail(100).copy()
+        df_chart = data['df']
         
         fig = make_subplots(
             rows=3, cols=1,
@@ -452,68 +535,54 @@ with tab1:
             subplot_titles=('Price & Indicators', 'RSI', 'Volume')
         )
         
-        # Candlestick
-        fig.add_trace(
-            go.Candlestick(
-                x=df_chart.index,
-                open=df_chart['open'],
-                high=df_chart['high'],
-                low=df_chart['low'],
-                close=df_chart['close'],
-                name='Price'
-            ),
-            row=1, col=1
-        )
-        
-        # EMA lines
-        fig.add_trace(
-            go.Scatter(
-                x=df_chart.index,
-                y=df_chart['ema_fast'],
-                name='EMA 50',
-                line=dict(color='blue', width=1)
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=df_chart.index,
-                y=df_chart['ema_slow'],
-                name='EMA 200',
-                line=dict(color='red', width=1)
-            ),
-            row=1, col=1
-        )
-        
-        # RSI
-        fig.add_trace(
-            go.Scatter(
-                x=df_chart.index,
-                y=df_chart['rsi'],
-                name='RSI',
-                line=dict(color='purple', width=2)
-            ),
-            row=2, col=1
+        # Volume colors
+        colors = np.where(
+            df_chart['close'].to_numpy() < df_chart['open'].to_numpy(), 'red', 'green'
+        ).tolist()
+        
+        # All traces added in one batch: price, EMAs, RSI (WebGL lines), volume
+        fig.add_traces(
+            [
+                go.Candlestick(
+                    x=df_chart.index,
+                    open=df_chart['open'],
+                    high=df_chart['high'],
+                    low=df_chart['low'],
+                    close=df_chart['close'],
+                    name='Price'
+                ),
+                go.Scattergl(
+                    x=df_chart.index,
+                    y=df_chart['ema_fast'],
+                    name='EMA 50',
+                    line=dict(color='blue', width=1)
+                ),
+                go.Scattergl(
+                    x=df_chart.index,
+                    y=df_chart['ema_slow'],
+                    name='EMA 200',
+                    line=dict(color='red', width=1)
+                ),
+                go.Scattergl(
+                    x=df_chart.index,
+                    y=df_chart['rsi'],
+                    name='RSI',
+                    line=dict(color='purple', width=2)
+                ),
+                go.Bar(
+                    x=df_chart.index,
+                    y=df_chart['volume'],
+                    name='Volume',
+                    marker_color=colors
+                )
+            ],
+            rows=[1, 1, 1, 2, 3],
+            cols=[1, 1, 1, 1, 1]
         )
         
         fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
         fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
         
-        # Volume
-        colors = ['red' if df_chart['close'].iloc[i] < df_chart['open'].iloc[i] 
-                  else 'green' for i in range(len(df_chart))]
-        
-        fig.add_trace(
-            go.Bar(
-                x=df_chart.index,
-                y=df_chart['volume'],
-                name='Volume',
-                marker_color=colors
-            ),
-            row=3, col=1
-        )
-        
         fig.update_layout(
             height=800,
             xaxis_rangeslider_visible=False,
@@ -545,14 +614,6 @@ with tab2:
     # Control buttons
     col1, col2, col3 = st.columns([1, 1, 2])
     
-    with col1:
-        if st.button("▶️ Start Live Feed", type="primary"):
-            st.session_state.live_feed_running = True
-    
-    with col2:
-        if st.button("⏹️ Stop Feed"):
-            st.session_state.live_feed_running = False
-    
     with col3:
         top_n = st.slider("Top N Coins", 10, 50, 20, 5)
     
@@ -562,18 +623,34 @@ with tab2:
     if 'live_feed_data' not in st.session_state:
         st.session_state.live_feed_data = None
     
+    with col1:
+        if st.button("▶️ Start Live Feed", type="primary"):
+            st.session_state.live_feed_running = True
+    
+    with col2:
+        if st.button("⏹️ Stop Feed"):
+            st.session_state.live_feed_running = False
+            if LIVE_FEED_AVAILABLE:
+                _live_feed_worker(top_n).stop()
+    
+    # Stop the background feed of a previous Top N selection
+    prev_top_n = st.session_state.get('live_feed_top_n')
+    if LIVE_FEED_AVAILABLE and prev_top_n not in (None, top_n):
+        _live_feed_worker(prev_top_n).stop()
+    st.session_state.live_feed_top_n = top_n
+    
     # Display live data
     if st.session_state.live_feed_running or st.button("🔄 Fetch Once"):
         with st.spinner("Fetching live market data..."):
             try:
-                import asyncio
-                from analysis.live_feed import LiveDataFeed
+                feed = _live_feed_worker(top_n)
                 
-                # Create feed instance
-                feed = LiveDataFeed(top_n_coins=top_n, update_interval=5)
-                
-                # Fetch data once
-                data = asyncio.run(feed.fetch_and_process())
+                if st.session_state.live_feed_running:
+                    # Background loop keeps the latest sample fresh
+                    feed.start_background()
+                    data = feed.get_latest_data() or feed.fetch_once()
+                else:
+                    data = feed.fetch_once()
                 
                 if data:
                     st.session_state.live_feed_data = data
@@ -587,10 +664,15 @@ with tab2:
                     # Display metrics
                     st.markdown("### 📊 Market Overview")
                     
+                    change = df_live['24h_change_percent'].to_numpy()
+                    avg_change = np.nanmean(change)
+                    gainers = int((change > 0).sum())
+                    losers = int((change < 0).sum())
+                    total_volume = np.nansum(df_live['volume_usd'].to_numpy()) / 1e9
+                    
                     col1, col2, col3, col4 = st.columns(4)
                     
                     with col1:
-                        avg_change = df_live['24h_change_percent'].mean()
                         st.metric(
                             "Avg 24h Change",
                             f"{avg_change:+.2f}%",
@@ -598,15 +680,12 @@ with tab2:
                         )
                     
                     with col2:
-                        gainers = len(df_live[df_live['24h_change_percent'] > 0])
                         st.metric("Gainers", gainers, delta=f"{gainers}/{len(df_live)}")
                     
                     with col3:
-                        losers = len(df_live[df_live['24h_change_percent'] < 0])
                         st.metric("Losers", losers, delta=f"-{losers}/{len(df_live)}")
                     
                     with col4:
-                        total_volume = df_live['volume_usd'].sum() / 1e9
                         st.metric("Total Volume", f"${total_volume:.2f}B")
                     
                     # Top gainers and losers
@@ -618,22 +697,22 @@ with tab2:
                         top_gainers = df_live.nlargest(5, '24h_change_percent')[
                             ['symbol', 'price_usd', '24h_change_percent']
                         ]
-                        for idx, row in top_gainers.iterrows():
-                            st.success(
-                                f"**{row['symbol']}**: ${row['price_usd']:.2f} "
-                                f"({row['24h_change_percent']:+.2f}%)"
-                            )
+                        st.dataframe(
+                            _style_movers(top_gainers),
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     
                     with col2:
                         st.markdown("#### 📉 Top 5 Losers")
                         top_losers = df_live.nsmallest(5, '24h_change_percent')[
                             ['symbol', 'price_usd', '24h_change_percent']
                         ]
-                        for idx, row in top_losers.iterrows():
-                            st.error(
-                                f"**{row['symbol']}**: ${row['price_usd']:.2f} "
-                                f"({row['24h_change_percent']:+.2f}%)"
-                            )
+                        st.dataframe(
+                            _style_movers(top_losers),
+                            use_container_width=True,
+                            hide_index=True
+                        )
                     
                     # Full market table
                     st.markdown("---")
@@ -651,15 +730,14 @@ with tab2:
                     ]
                     
                     # Format numbers
-                    display_df['Price (USD)'] = display_df['Price (USD)'].apply(
-                        lambda x: f"${x:,.2f}" if x >= 1 else f"${x:.6f}"
-                    )
-                    display_df['24h Change %'] = display_df['24h Change %'].apply(
-                        lambda x: f"{x:+.2f}%"
-                    )
-                    display_df['Volume (USD)'] = display_df['Volume (USD)'].apply(
-                        lambda x: f"${x/1e6:.2f}M"
+                    price = display_df['Price (USD)']
+                    display_df['Price (USD)'] = np.where(
+                        price.to_numpy() >= 1,
+                        price.map('${:,.2f}'.format),
+                        price.map('${:.6f}'.format)
                     )
+                    display_df['24h Change %'] = display_df['24h Change %'].map('{:+.2f}%'.format)
+                    display_df['Volume (USD)'] = (display_df['Volume (USD)'] / 1e6).map('${:.2f}M'.format)
                     
                     st.dataframe(
                         display_df,
@@ -675,10 +753,10 @@ with tab2:
                     fig = go.Figure(data=[go.Bar(
                         x=df_live['symbol'],
                         y=df_live['24h_change_percent'],
-                        marker_color=df_live['24h_change_percent'].apply(
-                            lambda x: 'green' if x > 0 else 'red'
+                        marker_color=np.where(
+                            df_live['24h_change_percent'].to_numpy() > 0, 'green', 'red'
                         ),
-                        text=df_live['24h_change_percent'].apply(lambda x: f"{x:+.1f}%"),
+                        text=df_live['24h_change_percent'].map('{:+.1f}%'.format),
                         textposition='outside'
                     )])
                     
@@ -825,10 +903,11 @@ with tab3:
                 st.markdown("### 📊 Detailed Statistics")
                 summary = engine.get_summary()
                 
-                summary_df = pd.DataFrame([
-                    {"Metric": k, "Value": v} for k, v in summary.items()
-                ])
-                st.dataframe(summary_df, use_container_width=True, hide_index=True)
+                summary_table = {
+                    "Metric": list(summary.keys()),
+                    "Value": list(summary.values())
+                }
+                st.dataframe(summary_table, use_container_width=True, hide_index=True)
                 
             except Exception as e:
                 st.error(f"❌ Error running backtest: {str(e)}")
@@ -842,7 +921,10 @@ with tab4:
     # Show current model status
     try:
         from pathlib import Path
-        model_path = Path(f'models/model_{timeframe}.pkl')
+        # Native LightGBM model, or a pickle saved by older versions
+        model_path = Path(f'models/model_{timeframe}.txt')
+        if not model_path.exists():
+            model_path = model_path.with_suffix('.pkl')
         if model_path.exists():
             st.success(f"✅ Model exists for {timeframe} timeframe")
             model_size = model_path.stat().st_size / 1024
@@ -873,40 +955,10 @@ with tab4:
         if st.button("🎓 Train Model (Quick)", type="primary", use_container_width=True):
             with st.spinner("Training ML model... This may take a few minutes."):
                 try:
-                    Config.SYMBOL = symbol
-                    Config.TIMEFRAME = timeframe
-                    
-                    # Fetch data
-                    handler = DataHandler()
-                    df = handler.fetch_ohlcv(limit=training_samples, use_cache=use_cache)
-                    
-                    # Calculate indicators
-                    indicators = TechnicalIndicators(df)
-                    df_indicators = indicators.calculate_all()
-                    
-                    # Train ML model
-                    ml_engine = MLEngine(timeframe=timeframe)
-                    metrics = ml_engine.train(df_indicators)
-                    
-                    st.session_state.ml_engine = ml_engine
+                    _, metrics = _train_model(symbol, timeframe, training_samples, use_cache)
                     
                     st.success("✅ Model training complete!")
-                    
-                    # Display metrics
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Accuracy", f"{metrics['accuracy']:.2%}")
-                    
-                    with col2:
-                        st.metric("Training Size", metrics['train_size'])
-                    
-                    with col3:
-                        st.metric("Test Size", metrics['test_size'])
-                    
-                    with col4:
-                        st.metric("Features", metrics['features'])
-                    
+                    _show_training_metrics(metrics)
                     st.balloons()
                     
                 except Exception as e:
@@ -917,42 +969,13 @@ with tab4:
                      help="Fetch new data from Binance and train model (better accuracy)"):
             with st.spinner("📥 Fetching fresh data and training... Please wait."):
                 try:
-                    Config.SYMBOL = symbol
-                    Config.TIMEFRAME = timeframe
-                    
                     # Force fresh data fetch
-                    handler = DataHandler()
-                    df = handler.fetch_ohlcv(limit=training_samples, use_cache=False)
-                    
-                    st.info(f"✅ Fetched {len(df)} fresh candles from Binance")
-                    
-                    # Calculate indicators
-                    indicators = TechnicalIndicators(df)
-                    df_indicators = indicators.calculate_all()
-                    
-                    # Train ML model
-                    ml_engine = MLEngine(timeframe=timeframe)
-                    metrics = ml_engine.train(df_indicators)
-                    
-                    st.session_state.ml_engine = ml_engine
+                    _load_training_ohlcv.clear()
+                    n_candles, metrics = _train_model(symbol, timeframe, training_samples, False)
                     
+                    st.info(f"✅ Fetched {n_candles} fresh candles from Binance")
                     st.success("✅ Model trained with fresh data!")
-                    
-                    # Display metrics
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Accuracy", f"{metrics['accuracy']:.2%}")
-                    
-                    with col2:
-                        st.metric("Training Size", metrics['train_size'])
-                    
-                    with col3:
-                        st.metric("Test Size", metrics['test_size'])
-                    
-                    with col4:
-                        st.metric("Features", metrics['features'])
-                    
+                    _show_training_metrics(metrics)
                     st.balloons()
                     st.info("💡 Tip: Fresh data usually gives better accuracy!")
                     
@@ -1044,7 +1067,7 @@ AZURE_OPENAI_KEY=your_api_key
     with st.expander("🎯 Strategy Parameters"):
         st.markdown("**Current Configuration:**")
         
-        params_df = pd.DataFrame({
+        params_table = {
             'Parameter': [
                 'EMA Fast', 'EMA Slow', 'RSI Period', 'ATR Period',
                 'ADX Threshold', 'Risk/Reward Ratio'
@@ -1053,8 +1076,8 @@ AZURE_OPENAI_KEY=your_api_key
                 Config.EMA_FAST, Config.EMA_SLOW, Config.RSI_PERIOD,
                 Config.ATR_PERIOD, Config.ADX_THRESHOLD, Config.RISK_REWARD_RATIO
             ]
-        })
-        st.dataframe(params_df, use_container_width=True, hide_index=True)
+        }
+        st.dataframe(params_table, use_container_width=True, hide_index=True)
         
         st.info("💡 To modify these, edit `config.py` file.")
     
@@ -1156,12 +1179,12 @@ with tab6:
                 st.markdown("**Errors by Type:**")
                 error_types = error_stats.get('error_types', {})
                 if error_types:
-                    type_df = pd.DataFrame([
-                        {"Error Type": k, "Count": v}
-                        for k, v in error_types.items()
-                    ])
+                    type_table = {
+                        "Error Type": list(error_types.keys()),
+                        "Count": list(error_types.values())
+                    }
                     st.dataframe(
-                        type_df,
+                        type_table,
                         use_container_width=True,
                         hide_index=True
                     )
@@ -1172,12 +1195,12 @@ with tab6:
                 st.markdown("**Errors by Component:**")
                 components = error_stats.get('components', {})
                 if components:
-                    comp_df = pd.DataFrame([
-                        {"Component": k, "Count": v}
-                        for k, v in components.items()
-                    ])
+                    comp_table = {
+                        "Component": list(components.keys()),
+                        "Count": list(components.values())
+                    }
                     st.dataframe(
-                        comp_df,
+                        comp_table,
                         use_container_width=True,
                         hide_index=True
                     )
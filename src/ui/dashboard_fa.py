@@ -9,43 +9,30 @@ BiX TradeBOT - داشبورد فارسی
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import json
 from datetime import datetime
+from importlib.util import find_spec
 import sys
-import os
 from pathlib import Path
 
-# Add src directory to path
-current_dir = Path(__file__).parent
-src_dir = current_dir.parent
+# Add src directory to path (هر rerun دوباره اضافه نشود)
+src_dir = Path(__file__).resolve().parent.parent
 root_dir = src_dir.parent
-sys.path.insert(0, str(src_dir))
+if str(src_dir) not in sys.path:
+    sys.path.insert(0, str(src_dir))
 
 from utils.config import Config
 from data.handler import DataHandler
 from data.indicators import TechnicalIndicators
-from core.ml_engine import MLEngine
 from core.risk_manager import RiskManager
 from core.strategy import SimpleHybridStrategy
 from utils.logger import get_logger
-from analysis.advanced_chart import AdvancedChartAnalysis
-
-# Import optional modules
-try:
-    from analysis.backtester import StrategyBacktester
-    BACKTESTER_AVAILABLE = True
-except ImportError:
-    BACKTESTER_AVAILABLE = False
-    print("⚠️ ماژول بک‌تست در دسترس نیست")
 
-try:
-    from analysis.live_feed import LiveDataFeed
-    LIVE_FEED_AVAILABLE = True
-except ImportError:
-    LIVE_FEED_AVAILABLE = False
-    st.warning("⚠️ ماژول دریافت داده زنده در دسترس نیست")
+# ماژول‌های سنگین (plotly، MLEngine، تحلیل نمودار) فقط در محل استفاده import می‌شوند
+
+# Optional modules (بررسی وجود بدون import کردن)
+BACKTESTER_AVAILABLE = find_spec('analysis.backtester') is not None
+if not BACKTESTER_AVAILABLE:
+    print("⚠️ ماژول بک‌تست در دسترس نیست")
 
 # Page configuration
 st.set_page_config(
@@ -151,29 +138,96 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
+
+@st.cache_resource
+def _get_data_handler():
+    """یک DataHandler مشترک برای همه نشست‌ها (کلاینت API یک بار ساخته می‌شود)"""
+    return DataHandler(use_ccxt=False)
+
+
+@st.cache_resource
+def _get_ml_engine():
+    """یک MLEngine مشترک برای همه نشست‌ها (مدل یک بار در هر پروسه بارگذاری می‌شود)"""
+    from core.ml_engine import MLEngine
+    return MLEngine()
+
+
+# Initialize session state (وضعیت مختص هر کاربر)
 if 'initialized' not in st.session_state:
     st.session_state.initialized = True
-    st.session_state.data_handler = DataHandler(use_ccxt=False)
     st.session_state.risk_manager = RiskManager()
-    st.session_state.ml_engine = MLEngine()
     st.session_state.logger = get_logger()
 
+
+# ستون‌هایی که داشبورد واقعاً استفاده می‌کند
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_ohlcv(symbol, timeframe, limit):
+    """دریافت کندل‌ها با کش ۶۰ ثانیه‌ای تا هر rerun دوباره به API نرود"""
+    return _get_data_handler().fetch_ohlcv(symbol, timeframe, limit=limit,
+                                           columns=OHLCV_COLUMNS)
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _live_ticker(symbol):
+    """تیکر ۲۴ ساعته با کش ۱۰ ثانیه‌ای تا هر rerun سایدبار منتظر API نماند"""
+    return _get_data_handler().client.get_ticker(symbol=symbol)
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _chart_levels(_df, symbol, timeframe, last_ts, n_rows):
+    """
+    سطوح حمایت/مقاومت، خطوط روند، فیبوناچی و الگوها برای یک دیتافریم
+
+    کلید کش اثر انگشت سبک (نماد، تایم‌فریم، آخرین زمان، تعداد ردیف) است؛
+    خود دیتافریم با پیشوند _ از hash شدن معاف است.
+    """
+    from analysis.advanced_chart import AdvancedChartAnalysis
+
+    analyzer = AdvancedChartAnalysis(_df)
+    return {
+        'support_resistance': analyzer.find_support_resistance(),
+        'trend_lines': analyzer.detect_trend_lines(),
+        'fibonacci': analyzer.calculate_fibonacci_levels(),
+        'patterns': analyzer.detect_candlestick_patterns()
+    }
+
+
 # Sidebar
 with st.sidebar:
     st.markdown("# ⚙️ تنظیمات")
     
-    st.markdown("### 📊 جفت ارز")
-    symbol = st.selectbox(
-        "انتخاب جفت ارز",
-        ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT'],
-        index=0,
-        help="جفت ارز مورد نظر برای تحلیل را انتخاب کنید"
-    )
+    # فرم تنظیمات: تغییر انتخاب‌ها تا زدن «اعمال» rerun و دریافت داده ایجاد نمی‌کند
+    with st.form("market_settings"):
+        st.markdown("### 📊 جفت ارز")
+        symbol = st.selectbox(
+            "انتخاب جفت ارز",
+            ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'SOLUSDT', 'XRPUSDT'],
+            index=0,
+            help="جفت ارز مورد نظر برای تحلیل را انتخاب کنید"
+        )
+    
+        st.markdown("### ⏰ بازه زمانی")
+        timeframe = st.selectbox(
+            "انتخاب تایم‌فریم",
+            ['1m', '5m', '15m', '1h', '4h', '1d'],
+            index=3,
+            help="بازه زمانی کندل‌ها"
+        )
+    
+        st.markdown("### 📈 تعداد کندل")
+        limit = st.slider("تعداد کندل", 50, 1000, 500, 50)
+        submitted = st.form_submit_button("اعمال", use_container_width=True)
+    
+    if submitted or 'market_settings' not in st.session_state:
+        st.session_state.market_settings = (symbol, timeframe, limit)
+    symbol, timeframe, limit = st.session_state.market_settings
     
     # نمایش قیمت فعلی زنده
     try:
-        live_price_data = st.session_state.data_handler.client.get_ticker(symbol=symbol)
+        live_price_data = _live_ticker(symbol)
         live_price = float(live_price_data['lastPrice'])
         price_change_24h = float(live_price_data['priceChangePercent'])
         
@@ -186,17 +240,6 @@ with st.sidebar:
     except Exception as e:
         st.warning(f"⚠️ خطا در دریافت قیمت زنده: {str(e)}")
     
-    st.markdown("### ⏰ بازه زمانی")
-    timeframe = st.selectbox(
-        "انتخاب تایم‌فریم",
-        ['1m', '5m', '15m', '1h', '4h', '1d'],
-        index=3,
-        help="بازه زمانی کندل‌ها"
-    )
-    
-    st.markdown("### 📈 تعداد کندل")
-    limit = st.slider("تعداد کندل", 50, 1000, 500, 50)
-    
     st.markdown("---")
     
     st.markdown("### 🤖 تنظیمات ML")
@@ -211,7 +254,7 @@ with st.sidebar:
     st.info("""
     **نحوه استفاده:**
     
-    ۱. جفت ارز و تایم‌فریم را انتخاب کنید
+    ۱. جفت ارز و تایم‌فریم را انتخاب و «اعمال» را بزنید
     
     ۲. دکمه "تحلیل بازار" را بزنید
     
@@ -259,16 +302,18 @@ with tab1:
         
         with st.spinner("⏳ در حال دریافت و تحلیل داده..."):
             try:
+                import plotly.graph_objects as go
+                from plotly.subplots import make_subplots
+                from analysis.advanced_chart import AdvancedChartAnalysis
+                from ui.chart_utils import (
+                    downsample_ohlcv, candlestick_traces, volume_bar, add_level_lines
+                )
+
                 # Fetch data
                 st.session_state.logger.info("شروع تحلیل بازار", component="ANALYSIS")
                 
-                dh = st.session_state.data_handler
-                
-                # پاک کردن کش برای دریافت داده‌های تازه
-                st.cache_data.clear()
-                
-                # دریافت داده‌های جدید
-                df = dh.fetch_ohlcv(symbol, timeframe, limit=limit)
+                # دریافت داده‌ها (کش با ttl؛ دکمه به‌روزرسانی کش را پاک می‌کند)
+                df = _load_ohlcv(symbol, timeframe, limit)
                 
                 if df is None or len(df) == 0:
                     st.error("❌ خطا در دریافت داده!")
@@ -282,7 +327,7 @@ with tab1:
                 
                 # دریافت قیمت واقعی زنده از API
                 try:
-                    live_ticker = dh.client.get_ticker(symbol=symbol)
+                    live_ticker = _live_ticker(symbol)
                     latest_price = float(live_ticker['lastPrice'])
                     st.session_state.logger.info(f"قیمت زنده: ${latest_price:,.2f}", component="LIVE_PRICE")
                 except Exception as e:
@@ -355,9 +400,9 @@ with tab1:
                     st.markdown("### 🤖 پیش‌بینی هوش مصنوعی")
                     
                     try:
-                        ml_engine = st.session_state.ml_engine
+                        ml_engine = _get_ml_engine()
                         
-                        if ml_engine.load_model():
+                        if ml_engine.is_trained or ml_engine.load_model():
                             predictions = ml_engine.get_prediction_confidence(df_indicators)
                             
                             if predictions is not None and len(predictions) > 0:
@@ -441,10 +486,30 @@ with tab1:
                 # Advanced Chart Analysis
                 st.markdown("### 📈 نمودار قیمت پیشرفته")
                 
-                # Initialize advanced chart analyzer
+                # Advanced chart analysis (cached per dataframe fingerprint)
+                analysis = dict(_chart_levels(
+                    df_indicators, symbol, timeframe,
+                    int(df_indicators.index[-1].value), len(df_indicators)
+                ))
+
+                # پیشنهادها به قیمت زنده وابسته‌اند و کش نمی‌شوند
                 chart_analyzer = AdvancedChartAnalysis(df_indicators)
-                analysis = chart_analyzer.get_complete_analysis(latest_price)
+                chart_analyzer.support_levels = analysis['support_resistance']['support']
+                chart_analyzer.resistance_levels = analysis['support_resistance']['resistance']
+                analysis['suggestions'] = chart_analyzer.suggest_entry_exit_points(latest_price)
                 
+                # بازه نمایش: فقط کندل‌های بازه انتخاب‌شده به مرورگر ارسال می‌شوند
+                view_start, view_end = st.select_slider(
+                    "🔎 بازه نمایش نمودار",
+                    options=df_indicators.index,
+                    value=(df_indicators.index[0], df_indicators.index[-1]),
+                    format_func=lambda ts: ts.strftime('%Y-%m-%d %H:%M')
+                )
+                df_view = DataHandler.slice_by_date(df_indicators, view_start, view_end)
+                
+                # کاهش تعداد کندل‌ها برای رسم سریع‌تر نمودار
+                df_plot = downsample_ohlcv(df_view)
+
                 # Create chart with advanced features
                 fig = make_subplots(
                     rows=3, cols=1,
@@ -454,24 +519,15 @@ with tab1:
                     subplot_titles=('قیمت و تحلیل پیشرفته', 'RSI', 'حجم معاملات')
                 )
                 
-                # Candlestick
-                fig.add_trace(
-                    go.Candlestick(
-                        x=df_indicators.index,
-                        open=df_indicators['open'],
-                        high=df_indicators['high'],
-                        low=df_indicators['low'],
-                        close=df_indicators['close'],
-                        name='قیمت'
-                    ),
-                    row=1, col=1
-                )
+                # Candlestick (WebGL برای تعداد کندل زیاد)
+                for trace in candlestick_traces(df_plot, name='قیمت'):
+                    fig.add_trace(trace, row=1, col=1)
                 
                 # EMAs
                 fig.add_trace(
                     go.Scatter(
-                        x=df_indicators.index,
-                        y=df_indicators['ema_fast'],
+                        x=df_plot.index,
+                        y=df_plot['ema_fast'],
                         name='EMA سریع',
                         line=dict(color='blue', width=1)
                     ),
@@ -480,50 +536,31 @@ with tab1:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=df_indicators.index,
-                        y=df_indicators['ema_slow'],
+                        x=df_plot.index,
+                        y=df_plot['ema_slow'],
                         name='EMA کند',
                         line=dict(color='red', width=1)
                     ),
                     row=1, col=1
                 )
                 
-                # Support levels (green horizontal lines)
-                for support in analysis['support_resistance']['support']:
-                    fig.add_hline(
-                        y=support,
-                        line_dash="solid",
-                        line_color="green",
-                        line_width=2,
-                        annotation_text=f"حمایت: ${support:,.2f}",
-                        annotation_position="left",
-                        row=1, col=1
-                    )
-                
-                # Resistance levels (red horizontal lines)
-                for resistance in analysis['support_resistance']['resistance']:
-                    fig.add_hline(
-                        y=resistance,
-                        line_dash="solid",
-                        line_color="red",
-                        line_width=2,
-                        annotation_text=f"مقاومت: ${resistance:,.2f}",
-                        annotation_position="left",
-                        row=1, col=1
-                    )
-                
-                # Fibonacci levels (yellow dashed lines)
+                # Support / resistance / Fibonacci levels (یک به‌روزرسانی layout به جای add_hline تکی)
+                levels = [
+                    dict(y=support, color='green', width=2,
+                         text=f"حمایت: ${support:,.2f}", position='left')
+                    for support in analysis['support_resistance']['support']
+                ]
+                levels += [
+                    dict(y=resistance, color='red', width=2,
+                         text=f"مقاومت: ${resistance:,.2f}", position='left')
+                    for resistance in analysis['support_resistance']['resistance']
+                ]
                 if analysis['fibonacci']['levels']:
-                    for level_name, price in analysis['fibonacci']['levels'].items():
-                        fig.add_hline(
-                            y=price,
-                            line_dash="dash",
-                            line_color="orange",
-                            line_width=1,
-                            annotation_text=f"فیبو {level_name}: ${price:,.2f}",
-                            annotation_position="right",
-                            row=1, col=1
-                        )
+                    levels += [
+                        dict(y=price, color='orange', width=1, dash='dash',
+                             text=f"فیبو {level_name}: ${price:,.2f}", position='right')
+                        for level_name, price in analysis['fibonacci']['levels'].items()
+                    ]
                 
                 # Trend lines
                 for trend in analysis['trend_lines']:
@@ -600,8 +637,8 @@ with tab1:
                 # RSI
                 fig.add_trace(
                     go.Scatter(
-                        x=df_indicators.index,
-                        y=df_indicators['rsi'],
+                        x=df_plot.index,
+                        y=df_plot['rsi'],
                         name='RSI',
                         line=dict(color='purple', width=2)
                     ),
@@ -609,22 +646,14 @@ with tab1:
                 )
                 
                 # RSI levels
-                fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
-                fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
+                levels += [
+                    dict(y=70, color='red', dash='dash', yref='y2'),
+                    dict(y=30, color='green', dash='dash', yref='y2')
+                ]
+                add_level_lines(fig, levels)
                 
                 # Volume
-                colors = ['red' if df_indicators['close'].iloc[i] < df_indicators['open'].iloc[i] else 'green' 
-                         for i in range(len(df_indicators))]
-                
-                fig.add_trace(
-                    go.Bar(
-                        x=df_indicators.index,
-                        y=df_indicators['volume'],
-                        name='حجم',
-                        marker_color=colors
-                    ),
-                    row=3, col=1
-                )
+                fig.add_trace(volume_bar(df_plot, name='حجم'), row=3, col=1)
                 
                 fig.update_layout(
                     height=1000,
@@ -634,6 +663,7 @@ with tab1:
                     hovermode='x unified'
                 )
                 
+                fig.update_xaxes(range=[view_start, view_end])
                 fig.update_xaxes(title_text="زمان", row=3, col=1)
                 fig.update_yaxes(title_text="قیمت (USDT)", row=1, col=1)
                 fig.update_yaxes(title_text="RSI", row=2, col=1)
@@ -787,9 +817,9 @@ with tab4:
     st.markdown("---")
     
     # ML Model Info
-    ml_engine = st.session_state.ml_engine
+    ml_engine = _get_ml_engine()
     
-    if ml_engine.load_model():
+    if ml_engine.is_trained or ml_engine.load_model():
         st.success("✅ مدل ML بارگذاری شد")
         
         col1, col2, col3 = st.columns(3)
@@ -844,8 +874,8 @@ with tab5:
         st.info("هیچ موقعیت بازی وجود ندارد")
     
     st.markdown("### 📜 تاریخچه معاملات")
-    if len(rm.trade_history) > 0:
-        st.dataframe(pd.DataFrame(rm.trade_history))
+    if rm.n_trades > 0:
+        st.dataframe(rm.trades_frame())
     else:
         st.info("هیچ معامله‌ای ثبت نشده است")
 
@@ -0,0 +1,19 @@
+"""
+Optional numba import shared by the compiled kernels
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback: leave the function as plain Python when numba is missing"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE']
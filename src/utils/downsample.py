@@ -0,0 +1,101 @@
+"""
+BiX TradeBOT - Downsampling Utilities
+======================================
+Shrink candle data and line series to a fixed number of points for plotting.
+
+Author: SALMAN ThinkTank AI Core
+Version: 1.0.0
+"""
+
+import numpy as np
+import pandas as pd
+
+# Upper bound of candles drawn per chart; kept under the dashboard's
+# 1000-candle slider cap so large views are actually thinned
+MAX_CHART_POINTS = 800
+
+
+def downsample_ohlcv(df, max_points=MAX_CHART_POINTS):
+    """
+    Merge consecutive candles so at most ``max_points`` rows remain.
+
+    Buckets are formed by position (not by clock time) so gaps in the
+    data do not create empty candles. Each bucket keeps the first open,
+    max high, min low, last close and summed volume; indicator columns
+    keep their last value.
+
+    Args:
+        df (pd.DataFrame): OHLCV data indexed by timestamp
+        max_points (int): Maximum number of rows to return
+
+    Returns:
+        pd.DataFrame: ``df`` itself when already small enough,
+        otherwise the bucketed frame indexed by bucket start time
+    """
+    if len(df) <= max_points:
+        return df
+
+    step = -(-len(df) // max_points)  # ceil division
+    buckets = np.arange(len(df)) // step
+
+    agg = {col: 'last' for col in df.columns}
+    agg.update({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'})
+    if 'volume' in df.columns:
+        agg['volume'] = 'sum'
+
+    resampled = df.groupby(buckets).agg(agg)
+    resampled.index = df.index[::step]
+    return resampled
+
+
+def _lttb_indices(x, y, n_out):
+    """Positions kept by Largest-Triangle-Three-Buckets (first and last always kept)"""
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Twice the triangle area between the last kept point, each bucket
+        # candidate and the average of the next bucket
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+
+    return idx
+
+
+def lttb(series, max_points=MAX_CHART_POINTS):
+    """
+    Downsample a line series with Largest-Triangle-Three-Buckets.
+
+    Unlike taking every n-th point, LTTB keeps the points that define the
+    visual shape of the line (peaks, troughs, turns).
+
+    Args:
+        series (pd.Series): Values indexed by timestamp or position
+        max_points (int): Maximum number of points to return
+
+    Returns:
+        pd.Series: ``series`` without NaNs, reduced to ``max_points``
+        points when longer
+    """
+    series = series.dropna()
+    max_points = max(max_points, 3)
+    if len(series) <= max_points:
+        return series
+
+    if pd.api.types.is_datetime64_any_dtype(series.index):
+        x = series.index.values.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    else:
+        x = np.arange(len(series), dtype=np.float64)
+
+    y = series.to_numpy(dtype=np.float64)
+    return series.iloc[_lttb_indices(x, y, max_points)]
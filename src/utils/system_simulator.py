@@ -319,8 +319,8 @@ class SystemSimulator:
                 if trade:
                     test['details']['close_position'] = 'PASS'
                     test['details']['pnl'] = f"${trade['pnl']:,.2f}"
-                    test['details']['pnl_percent'] = f"{trade['pnl_percent']}%"
-                    test['details']['trades_in_history'] = len(rm.trade_history)
+                    test['details']['pnl_percent'] = f"{trade['pnl_percent']:.2f}%"
+                    test['details']['trades_in_history'] = rm.n_trades
                 else:
                     test['details']['close_position'] = 'FAIL - No trade returned'
             
@@ -332,7 +332,7 @@ class SystemSimulator:
             
             test['status'] = 'PASS'
             win_rate_pct = stats['win_rate'] * 100
-            test['message'] = f'All risk management functions working ({len(rm.trade_history)} trades, {win_rate_pct:.0f}% win rate)'
+            test['message'] = f'All risk management functions working ({rm.n_trades} trades, {win_rate_pct:.0f}% win rate)'
             
         except Exception as e:
             test['status'] = 'FAIL'
@@ -0,0 +1,76 @@
+"""
+Unit tests for ui.chart_utils module
+"""
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from ui.chart_utils import downsample_ohlcv, lttb
+
+
+class TestChartUtils:
+    """Test suite for chart downsampling helpers"""
+
+    @pytest.fixture
+    def sample_ohlcv_data(self):
+        """Generate sample OHLCV data for testing"""
+        dates = pd.date_range(start='2025-01-01', periods=5000, freq='h')
+        close = 100 + np.cumsum(np.random.randn(5000))
+        df = pd.DataFrame({
+            'open': close + np.random.randn(5000),
+            'high': close + 2,
+            'low': close - 2,
+            'close': close,
+            'volume': np.random.uniform(1000, 10000, 5000)
+        }, index=dates)
+        return df
+
+    def test_downsample_ohlcv_small_frame_unchanged(self, sample_ohlcv_data):
+        """Test that frames under the limit are returned as-is"""
+        df = sample_ohlcv_data.head(100)
+        assert downsample_ohlcv(df, max_points=200) is df
+
+    def test_downsample_ohlcv_aggregates(self, sample_ohlcv_data):
+        """Test OHLCV bucket aggregation"""
+        df = sample_ohlcv_data
+        result = downsample_ohlcv(df, max_points=1000)
+
+        assert len(result) <= 1000
+        assert result['high'].max() == df['high'].max()
+        assert result['low'].min() == df['low'].min()
+        assert result['volume'].sum() == pytest.approx(df['volume'].sum())
+        assert result['open'].iloc[0] == df['open'].iloc[0]
+        assert result['close'].iloc[-1] == df['close'].iloc[-1]
+
+    def test_lttb_keeps_shape(self, sample_ohlcv_data):
+        """Test LTTB output size and endpoints"""
+        series = sample_ohlcv_data['close']
+        result = lttb(series, max_points=500)
+
+        assert len(result) == 500
+        assert result.index[0] == series.index[0]
+        assert result.index[-1] == series.index[-1]
+        assert result.index.is_monotonic_increasing
+
+    def test_lttb_keeps_spike(self):
+        """Test that a single spike survives downsampling"""
+        values = np.zeros(10000)
+        values[1234] = 100.0
+        result = lttb(pd.Series(values), max_points=100)
+
+        assert result.max() == 100.0
+
+    def test_lttb_drops_nan(self):
+        """Test that NaN warm-up values are removed"""
+        series = pd.Series([np.nan, np.nan, 1.0, 2.0, 3.0])
+        result = lttb(series, max_points=10)
+
+        assert result.tolist() == [1.0, 2.0, 3.0]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -93,13 +93,41 @@ class TestDataHandler:
         assert price == 50000.00
         mock_instance.get_symbol_ticker.assert_called_once_with(symbol='BTCUSDT')
     
+    @patch('data.handler.Client')
+    def test_fetch_latest_prices(self, mock_client):
+        """Test fetching several prices in one ticker request"""
+        mock_instance = mock_client.return_value
+        mock_instance.get_symbol_ticker.return_value = [
+            {'symbol': 'BTCUSDT', 'price': '50000.00'},
+            {'symbol': 'ETHUSDT', 'price': '3000.50'}
+        ]
+        
+        handler = DataHandler(use_ccxt=False)
+        prices = handler.fetch_latest_prices(['BTCUSDT', 'ETHUSDT'])
+        
+        assert prices == {'BTCUSDT': 50000.00, 'ETHUSDT': 3000.50}
+        mock_instance.get_symbol_ticker.assert_called_once_with(symbols='["BTCUSDT","ETHUSDT"]')
+    
     def test_cache_filename_generation(self, handler):
         """Test cache filename generation"""
         filename = handler._get_cache_filename(
             'BTCUSDT', '1h', '2025-01-01', '2025-01-31'
         )
-        expected = handler.cache_dir / 'BTCUSDT_1h_2025-01-01_2025-01-31.csv'
-        assert filename == expected
+        other = handler._get_cache_filename(
+            'BTCUSDT', '1h', '2025-01-01', '2025-02-28'
+        )
+        assert filename.parent == handler.cache_dir
+        assert filename.name.startswith('BTCUSDT_1h_')
+        assert filename.suffix == '.parquet'
+        assert filename != other
+    
+    def test_cache_filename_ccxt_symbol(self, handler):
+        """Test that slash-separated symbols stay inside the cache directory"""
+        filename = handler._get_cache_filename(
+            'BTC/USDT', '1h', '2025-01-01', '2025-01-31'
+        )
+        assert filename.parent == handler.cache_dir
+        assert filename.name.startswith('BTC_USDT_1h_')
     
     @patch('data.handler.Client')
     def test_fetch_ohlcv_with_cache(self, mock_client, handler, sample_ohlcv_data, tmp_path):
@@ -107,7 +135,7 @@ class TestDataHandler:
         # Setup cache
         handler.cache_dir = tmp_path
         cache_file = handler._get_cache_filename('BTCUSDT', '1h', '2025-01-01', '2025-01-31')
-        sample_ohlcv_data.to_csv(cache_file)
+        sample_ohlcv_data.to_parquet(cache_file)
         
         # Fetch data
         df = handler.fetch_ohlcv('BTCUSDT', '1h', '2025-01-01', '2025-01-31', use_cache=True)
@@ -115,6 +143,55 @@ class TestDataHandler:
         assert df is not None
         assert len(df) == 100
         assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+
+    @patch('data.handler.Client')
+    def test_fetch_ohlcv_cache_columns(self, mock_client, handler, sample_ohlcv_data, tmp_path):
+        """Test reading only requested columns from cache"""
+        handler.cache_dir = tmp_path
+        cache_file = handler._get_cache_filename('BTCUSDT', '1h', '2025-01-01', '2025-01-31')
+        sample_ohlcv_data.to_parquet(cache_file)
+
+        df = handler.fetch_ohlcv('BTCUSDT', '1h', '2025-01-01', '2025-01-31',
+                                 use_cache=True, columns=['open', 'close'])
+
+        assert list(df.columns) == ['open', 'close']
+        assert isinstance(df.index, pd.DatetimeIndex)
+
+    @patch('data.handler.Client')
+    def test_fetch_ohlcv_migrates_csv_cache(self, mock_client, handler, sample_ohlcv_data, tmp_path):
+        """Test that a legacy CSV cache file is converted to Parquet and reused"""
+        handler.cache_dir = tmp_path
+        sample_ohlcv_data.to_csv(tmp_path / 'BTCUSDT_1h_2025-01-01_2025-01-31.csv')
+        
+        df = handler.fetch_ohlcv('BTCUSDT', '1h', '2025-01-01', '2025-01-31', use_cache=True)
+        
+        assert handler._get_cache_filename('BTCUSDT', '1h', '2025-01-01', '2025-01-31').exists()
+        assert len(df) == 100
+        assert isinstance(df.index, pd.DatetimeIndex)
+        assert np.allclose(df['close'].values, sample_ohlcv_data['close'].values)
+        handler.client.get_historical_klines.assert_not_called()
+    
+    def test_fetch_ohlcv_extends_cached_range(self, handler, sample_ohlcv_data, tmp_path):
+        """Test a longer range from the same start only fetches the missing tail"""
+        handler.cache_dir = tmp_path
+        sample_ohlcv_data.to_parquet(
+            handler._get_cache_filename('BTCUSDT', '1h', '2025-01-01', '2025-01-05')
+        )
+        last_ms = int(sample_ohlcv_data.index[-1].timestamp() * 1000)
+        handler.client.get_historical_klines.return_value = [
+            [last_ms + i * 3600000, '100', '120', '90', '110', '1000', 0, '0', 0, '0', '0', '0']
+            for i in range(3)
+        ]
+        
+        df = handler.fetch_ohlcv('BTCUSDT', '1h', '2025-01-01', '2025-01-31', use_cache=True)
+        
+        start = handler.client.get_historical_klines.call_args[0][2]
+        assert pd.Timestamp(start) == sample_ohlcv_data.index[-1]
+        assert len(df) == 102
+        assert df.index.is_unique and df.index.is_monotonic_increasing
+        assert np.allclose(df['close'].values[:99], sample_ohlcv_data['close'].values[:99])
+        assert df['close'].iloc[99] == 110.0
+        assert handler._get_cache_filename('BTCUSDT', '1h', '2025-01-01', '2025-01-31').exists()
     
     @patch('data.handler.Client')
     def test_fetch_ohlcv_no_cache(self, mock_client, handler):
@@ -135,6 +212,42 @@ class TestDataHandler:
         assert len(df) == 2
         assert 'close' in df.columns
     
+    def test_fetch_ccxt_pages_bounded(self, handler):
+        """Test CCXT pages run a few at a time and the client is closed"""
+        import asyncio
+
+        class FakeExchange:
+            def __init__(self):
+                self.in_flight = 0
+                self.max_in_flight = 0
+                self.closed = False
+
+            async def fetch_ohlcv(self, symbol, timeframe, since, limit):
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0)
+                self.in_flight -= 1
+                if since == 'bad':
+                    raise RuntimeError('page failed')
+                return [[since, 1.0, 2.0, 0.5, 1.5, 10.0]]
+
+            async def close(self):
+                self.closed = True
+
+        exchange = FakeExchange()
+        handler._init_ccxt_client = lambda module: exchange
+
+        pages = asyncio.run(handler._fetch_ccxt_pages('BTC/USDT', '1h', list(range(20)), 1000))
+
+        assert [page[0][0] for page in pages] == list(range(20))
+        assert exchange.max_in_flight == handler._CCXT_MAX_CONCURRENT_PAGES
+        assert exchange.closed
+
+        exchange = FakeExchange()
+        with pytest.raises(RuntimeError):
+            asyncio.run(handler._fetch_ccxt_pages('BTC/USDT', '1h', [0, 'bad'], 1000))
+        assert exchange.closed
+    
     @patch('data.handler.Client')
     def test_get_account_balance(self, mock_client):
         """Test getting account balance"""
@@ -162,6 +275,18 @@ class TestDataHandler:
             with pytest.raises(Exception):
                 handler.fetch_ohlcv('BTCUSDT', '1h', use_cache=False)
 
+    def test_slice_by_date(self):
+        """Test positional date-range slicing"""
+        dates = pd.date_range(start='2025-01-01', periods=48, freq='h')
+        df = pd.DataFrame({'close': np.arange(48.0)}, index=dates)
+
+        sliced = DataHandler.slice_by_date(df, '2025-01-01 05:00', '2025-01-02')
+
+        assert sliced.index[0] == pd.Timestamp('2025-01-01 05:00')
+        assert sliced.index[-1] == pd.Timestamp('2025-01-02')
+        assert len(DataHandler.slice_by_date(df)) == 48
+        assert DataHandler.slice_by_date(df, end_date='2024-12-31').empty
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--cov=data.handler', '--cov-report=term-missing'])
@@ -145,6 +145,19 @@ class TestTechnicalIndicators:
         
         assert signals['pullback_signal'] in [-1, 0, 1]
     
+    def test_export_parquet_roundtrip(self, indicators, tmp_path, monkeypatch):
+        """Test default Parquet export reads back unchanged"""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'results').mkdir()
+        indicators.calculate_all()
+
+        output_path = indicators.export()
+
+        assert output_path == 'results/indicators_output.parquet'
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(output_path), indicators.df, check_freq=False
+        )
+    
     def test_with_minimal_data(self):
         """Test with minimal data (edge case)"""
         dates = pd.date_range(start='2025-01-01', periods=50, freq='1H')
@@ -10,7 +10,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from core.ml_engine import MLEngine
+from core.ml_engine import MLEngine, _rolling_stats
 
 
 class TestMLEngine:
@@ -43,6 +43,18 @@ class TestMLEngine:
         df = pd.DataFrame(data, index=dates)
         return df
     
+    @pytest.fixture
+    def sample_data_full(self, sample_data_with_indicators):
+        """Sample data with every indicator column the features need"""
+        df = sample_data_with_indicators.copy()
+        rng = np.random.default_rng(42)
+        df['donchian_upper'] = df['high'].rolling(20).max()
+        df['donchian_lower'] = df['low'].rolling(20).min()
+        df['di_plus'] = rng.uniform(10, 40, len(df))
+        df['di_minus'] = rng.uniform(10, 40, len(df))
+        df['combined_signal'] = rng.integers(-1, 2, len(df))
+        return df
+
     @pytest.fixture
     def ml_engine(self):
         """Create MLEngine instance"""
@@ -97,7 +109,33 @@ class TestMLEngine:
         
         assert loaded is True
         assert new_engine.model is not None
-    
+
+    def test_load_legacy_pickle_model(self, ml_engine, sample_data_full, tmp_path):
+        """Test loading a model pickled by older versions"""
+        import pickle
+        ml_engine.booster_path = tmp_path / 'native.txt'
+        ml_engine.features_path = tmp_path / 'native.json'
+        ml_engine.scaler_params_path = tmp_path / 'native.npz'
+        ml_engine.train(sample_data_full)
+        expected = ml_engine.predict(sample_data_full)
+
+        legacy_engine = MLEngine(timeframe='1h')
+        legacy_engine.model_path = tmp_path / 'model_1h.pkl'
+        legacy_engine.scaler_path = tmp_path / 'scaler_1h.pkl'
+        legacy_engine.booster_path = tmp_path / 'model_1h.txt'
+        with open(legacy_engine.model_path, 'wb') as f:
+            pickle.dump({
+                'model': ml_engine.model,
+                'feature_columns': ml_engine.feature_columns
+            }, f)
+        with open(legacy_engine.scaler_path, 'wb') as f:
+            pickle.dump(ml_engine.scaler, f)
+
+        assert legacy_engine.load_model() is True
+        np.testing.assert_array_equal(
+            legacy_engine.predict(sample_data_full), expected
+        )
+
     def test_feature_engineering(self, ml_engine, sample_data_with_indicators):
         """Test feature engineering"""
         ml_engine.train(sample_data_with_indicators)
@@ -122,5 +160,35 @@ class TestMLEngine:
             ml_engine.train(small_df)
 
 
+class TestRollingStats:
+    """Test suite for the rolling z-score / volume-ratio kernel"""
+
+    def test_matches_pandas(self):
+        """Test the single-pass sums agree with pandas rolling"""
+        rng = np.random.default_rng(3)
+        close = 65000 + np.cumsum(rng.normal(0, 50, 2000))
+        volume = rng.uniform(1, 100, 2000)
+        close[400] = np.nan
+        volume[700] = np.nan
+
+        z_score, volume_ratio = _rolling_stats(close, volume, 20)
+
+        c, v = pd.Series(close), pd.Series(volume)
+        expected_z = (c - c.rolling(20).mean()) / c.rolling(20).std()
+        expected_ratio = v / v.rolling(20).mean()
+        np.testing.assert_allclose(z_score, expected_z, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(volume_ratio, expected_ratio, rtol=1e-9)
+
+    def test_flat_window_is_nan(self):
+        """Test a flat window gives NaN like the pandas fallback"""
+        close = np.r_[np.linspace(100.0, 110.0, 10), np.full(25, 110.0)]
+
+        z_score, _ = _rolling_stats(close, np.ones(len(close)), 20)
+
+        c = pd.Series(close)
+        expected = (c - c.rolling(20).mean()) / c.rolling(20).std()
+        assert np.isnan(z_score[-1]) and np.isnan(expected.iloc[-1])
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--cov=core.ml_engine', '--cov-report=term-missing'])
@@ -1,7 +1,9 @@
 """
 Unit tests for core.risk_manager module
 """
+import logging
 import pytest
+import numpy as np
 import sys
 from pathlib import Path
 
@@ -113,5 +115,199 @@ class TestRiskManager:
         assert position['value'] > 0
 
 
+class TestPositionSizeBatch:
+    """Test suite for RiskManager.calculate_position_size_batch"""
+
+    def test_matches_scalar_sizing(self):
+        """Test batch sizing agrees with per-signal sizing"""
+        rm = RiskManager(initial_capital=10000)
+        entry_prices = [50000.0, 50000.0, 3000.0, 1.25]
+        atrs = [10000.0, 500.0, 40.0, 0.02]
+        directions = ['long', 'short', 'short', 'long']
+
+        batch = rm.calculate_position_size_batch(entry_prices, atrs, directions)
+
+        for i, args in enumerate(zip(entry_prices, atrs, directions)):
+            single = rm.calculate_position_size(*args)
+            for key, value in single.items():
+                assert batch[key][i] == pytest.approx(value)
+
+
+class TestStopLossTakeProfit:
+    """Test suite for RiskManager.check_stop_loss_take_profit"""
+
+    @pytest.fixture
+    def risk_manager(self):
+        """RiskManager with two long and one short position open"""
+        rm = RiskManager(initial_capital=10000)
+        rm.open_position('BTCUSDT', 100.0, 1.0, 'long', 95.0, 110.0)
+        rm.open_position('BTCUSDT', 100.0, 1.0, 'short', 105.0, 90.0)
+        rm.open_position('BTCUSDT', 100.0, 1.0, 'long', 98.0, 104.0)
+        return rm
+
+    @pytest.mark.parametrize('vector_min, use_kernel', [
+        (32, False), (0, False), (0, True)
+    ])
+    def test_hits_by_price(self, risk_manager, vector_min, use_kernel, monkeypatch):
+        """Test SL/TP hits on the loop, NumPy and scan-kernel paths"""
+        monkeypatch.setattr('core.risk_manager.VECTOR_SCAN_MIN_POSITIONS', vector_min)
+        monkeypatch.setattr('core.risk_manager.SCAN_KERNEL_AVAILABLE', use_kernel)
+
+        assert risk_manager.check_stop_loss_take_profit(100.0) == []
+        assert risk_manager.check_stop_loss_take_profit(97.0) == [
+            (2, 'stop_loss')
+        ]
+        assert risk_manager.check_stop_loss_take_profit(105.0) == [
+            (1, 'stop_loss'), (2, 'take_profit')
+        ]
+        assert risk_manager.check_stop_loss_take_profit(89.0) == [
+            (0, 'stop_loss'), (1, 'take_profit'), (2, 'stop_loss')
+        ]
+
+    @pytest.mark.parametrize('use_kernel', [False, True])
+    def test_float32_levels_match_float64_loop(self, use_kernel, monkeypatch):
+        """Test the float32 scan agrees with the per-position loop"""
+        monkeypatch.setattr('core.risk_manager.SCAN_KERNEL_AVAILABLE', use_kernel)
+        rng = np.random.default_rng(7)
+        rm = RiskManager(initial_capital=10000)
+        for _ in range(200):
+            entry = round(rng.uniform(60000, 70000), 2)
+            offset = round(rng.uniform(50, 2000), 2)
+            if rng.random() < 0.5:
+                rm.open_position('BTCUSDT', entry, 0.01, 'long',
+                                 entry - offset, entry + 2 * offset)
+            else:
+                rm.open_position('BTCUSDT', entry, 0.01, 'short',
+                                 entry + offset, entry - 2 * offset)
+
+        for price in np.round(rng.uniform(55000, 75000, 50), 2) + 0.005:
+            monkeypatch.setattr('core.risk_manager.VECTOR_SCAN_MIN_POSITIONS', 32)
+            expected = rm.check_stop_loss_take_profit(price)
+            monkeypatch.setattr('core.risk_manager.VECTOR_SCAN_MIN_POSITIONS', 0)
+            assert rm.check_stop_loss_take_profit(price) == expected
+
+    @pytest.mark.parametrize('use_kernel', [False, True])
+    def test_near_miss_independent_of_book_size(self, use_kernel, monkeypatch):
+        """Test a price within one float32 step of a level isn't a hit"""
+        monkeypatch.setattr('core.risk_manager.SCAN_KERNEL_AVAILABLE', use_kernel)
+        rm = RiskManager(initial_capital=10000)
+        rm.open_position('BTCUSDT', 66000.0, 0.01, 'long', 65432.17, 67000.0)
+        price = 65432.171
+        assert np.float32(price) == np.float32(65432.17)
+
+        for vector_min in (32, 0):
+            monkeypatch.setattr('core.risk_manager.VECTOR_SCAN_MIN_POSITIONS', vector_min)
+            assert rm.check_stop_loss_take_profit(price) == []
+            assert rm.check_stop_loss_take_profit(65432.17) == [(0, 'stop_loss')]
+
+    def test_arrays_follow_closed_positions(self, risk_manager, monkeypatch):
+        """Test closing a position keeps the others in order"""
+        monkeypatch.setattr('core.risk_manager.VECTOR_SCAN_MIN_POSITIONS', 0)
+
+        risk_manager.close_position(0, 100.0)
+
+        assert [p['stop_loss'] for p in risk_manager.positions] == [105.0, 98.0]
+        assert risk_manager.check_stop_loss_take_profit(105.0) == [
+            (0, 'stop_loss'), (1, 'take_profit')
+        ]
+
+        risk_manager.close_position(-1, 100.0)
+
+        assert [p['stop_loss'] for p in risk_manager.positions] == [105.0]
+        assert risk_manager.check_stop_loss_take_profit(105.0) == [
+            (0, 'stop_loss')
+        ]
+
+    def test_close_hits_highest_index_first(self, risk_manager):
+        """Test closing every hit from the highest index down"""
+        hits = risk_manager.check_stop_loss_take_profit(89.0)
+
+        for i, reason in reversed(hits):
+            risk_manager.close_position(i, 89.0, reason)
+
+        assert risk_manager.positions == []
+        assert [t['stop_loss'] for t in risk_manager.trade_history] == [
+            98.0, 105.0, 95.0
+        ]
+
+
+class TestTradeHistory:
+    """Test suite for closed-trade recording"""
+
+    @pytest.fixture
+    def risk_manager(self):
+        """RiskManager with one winning long and one losing short closed"""
+        rm = RiskManager(initial_capital=10000)
+        rm.open_position('BTCUSDT', 100.0, 2.0, 'long', 95.0, 110.0)
+        rm.close_position(0, 110.0, 'take_profit')
+        rm.open_position('ETHUSDT', 50.0, 1.0, 'short', 55.0, 40.0)
+        rm.close_position(0, 55.0, 'stop_loss')
+        return rm
+
+    def test_trade_history_records(self, risk_manager):
+        """Test trade_history returns closed trades oldest first"""
+        history = risk_manager.trade_history
+
+        assert [t['symbol'] for t in history] == ['BTCUSDT', 'ETHUSDT']
+        assert [t['direction'] for t in history] == ['long', 'short']
+        assert [t['exit_reason'] for t in history] == ['take_profit', 'stop_loss']
+        assert [t['pnl'] for t in history] == [20.0, -5.0]
+        assert history[-1]['equity_after'] == 10015.0
+
+    def test_count_and_frame(self, risk_manager):
+        """Test n_trades and trades_frame match trade_history"""
+        df = risk_manager.trades_frame()
+
+        assert risk_manager.n_trades == len(df) == 2
+        assert df['pnl'].tolist() == [20.0, -5.0]
+        assert df['status'].tolist() == ['open', 'open']
+        assert isinstance(risk_manager.trade_history, tuple)
+
+    def test_times_are_datetimes(self, risk_manager):
+        """Test open positions and closed trades expose datetime64 times"""
+        risk_manager.open_position('BTCUSDT', 100.0, 1.0, 'long', 95.0, 110.0)
+        position = risk_manager.positions[0]
+        trade = risk_manager.close_position(0, 101.0)
+
+        assert isinstance(position['entry_time'], np.datetime64)
+        assert isinstance(trade['exit_time'], np.datetime64)
+        assert trade['exit_time'] >= trade['entry_time']
+
+    def test_close_with_numpy_exit_price(self, risk_manager, caplog):
+        """Test closing at a NumPy float price logs and records the trade"""
+        risk_manager.open_position('BTCUSDT', 100.0, 1.0, 'long', 95.0, 110.0)
+
+        with caplog.at_level(logging.INFO, logger='core.risk_manager'):
+            trade = risk_manager.close_position(0, np.float64(110.0))
+
+        assert trade['pnl'] == 10.0
+        assert risk_manager.positions == []
+        assert 'Closed LONG position' in caplog.text
+
+    def test_performance_stats(self, risk_manager):
+        """Test stats computed from the trade array"""
+        stats = risk_manager.get_performance_stats()
+
+        assert stats['total_trades'] == 2
+        assert stats['winning_trades'] == 1
+        assert stats['win_rate'] == 50.0
+        assert stats['total_pnl'] == 15.0
+        assert stats['profit_factor'] == 4.0
+
+    def test_export_trade_log(self, risk_manager, tmp_path, monkeypatch):
+        """Test trade log CSV export"""
+        import pandas as pd
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'results').mkdir()
+
+        output_path = risk_manager.export_trade_log()
+
+        df = pd.read_csv(output_path)
+        assert len(df) == 2
+        assert df['exit_reason'].tolist() == ['take_profit', 'stop_loss']
+        with open(output_path) as f:
+            assert f.readline().startswith('symbol,entry_price,size,direction,')
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--cov=core.risk_manager', '--cov-report=term-missing'])